@@ -0,0 +1,259 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pyarrow as pa
+
+from data_models import DataField, DataModel, FieldType, _load_sample_models
+from exporter import FILE_EXTENSIONS, export_data
+from generator import effective_workers, generate_data_iter, generate_field_data, generate_table, unique_value_space
+from instrumentation import current_rss
+
+EXPORT_FORMATS = ["csv", "json", "ndjson", "parquet", "excel", "sqlite"]
+# Bulk load into the database given by --sql-url, e.g. a local PostgreSQL or MySQL
+SQL_FORMAT = "sql"
+SQL_TABLE = "benchmark_export"
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "quick": {
+        "field_rows": 100_000,
+        "rows": [1_000, 100_000],
+        "batch_sizes": [10_000],
+        "workers": [1],
+        "export_rows": 100_000,
+        "repeat": 3,
+    },
+    "full": {
+        "field_rows": 1_000_000,
+        "rows": [1_000, 10_000, 100_000, 1_000_000, 10_000_000],
+        "batch_sizes": [1_000, 10_000, 100_000],
+        "workers": [1, 2, 4, 8],
+        "export_rows": 1_000_000,
+        "repeat": 3,
+    },
+}
+
+def _best_of(func: Callable[[], Any], repeat: int) -> float:
+    """Smallest wall time of several runs, which is the least noisy estimate"""
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start_time)
+    return min(timings)
+
+def _peak_rss() -> Optional[int]:
+    """Peak resident set size of this process in bytes, where the platform reports it"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def _environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pyarrow": pa.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def bench_fields(rows: int, repeat: int) -> List[Dict[str, Any]]:
+    """Rows per second of generate_field_data for every field type"""
+    results = []
+    for field_type in FieldType:
+        for unique in (False, True):
+            # Unique numbers need a range wide enough for every row
+            options = {"min": 0, "max": rows * 10} if unique else {}
+            field = DataField(
+                name=f"bench_{field_type.value}", description="", type=field_type, unique=unique, options=options
+            )
+            space = unique_value_space(field) if unique else None
+            if space is not None and space < rows:
+                continue
+            # Warm-up so one-off costs such as the Faker pools are not timed
+            generate_field_data(field, 1, np.random.default_rng(0), 0)
+            seconds = _best_of(
+                lambda: generate_field_data(field, rows, np.random.default_rng(0), 0),
+                repeat
+            )
+            results.append({
+                "field_type": field_type.value,
+                "unique": unique,
+                "rows": rows,
+                "seconds": seconds,
+                "rows_per_sec": rows / seconds,
+            })
+    return results
+
+def bench_generation(
+    models: List[DataModel],
+    row_counts: List[int],
+    batch_sizes: List[int],
+    workers: List[int],
+    repeat: int
+) -> List[Dict[str, Any]]:
+    """Scaling of whole-model generation across rows, batch size and worker count"""
+    results = []
+    for model in models:
+        for rows in row_counts:
+            for batch_size in batch_sizes:
+                if batch_size > rows and batch_size != min(batch_sizes):
+                    continue
+                for max_workers in workers:
+                    # The largest runs are slow enough that one sample is representative
+                    runs = 1 if rows >= 1_000_000 else repeat
+                    seconds = _best_of(
+                        lambda: generate_table(model, rows, batch_size, 0, None, max_workers),
+                        runs
+                    )
+                    results.append({
+                        "model": model.name,
+                        "rows": rows,
+                        "batch_size": batch_size,
+                        "max_workers": max_workers,
+                        # Single-task jobs run in-process, and no run uses more workers than the pool has
+                        "workers_used": effective_workers(rows, batch_size, max_workers),
+                        "seconds": seconds,
+                        "rows_per_sec": rows / seconds,
+                    })
+    return results
+
+def _drop_table(sql_url: str, table_name: str):
+    import sqlalchemy
+    import sql_loader
+
+    sqlalchemy.Table(table_name, sqlalchemy.MetaData()).drop(sql_loader.get_engine(sql_url), checkfirst=True)
+
+def _export_case(model: DataModel, format_type: str, rows: int, sql_url: Optional[str] = None) -> Dict[str, Any]:
+    """Stream generation into one export; runs in a fresh process so peak RSS is per case"""
+    # Batches go straight into the writer, so the peak reflects the format's own buffering
+    batches = generate_data_iter(model, rows, seed=0, max_workers=1)
+    rss_start = current_rss()
+    with tempfile.TemporaryDirectory() as directory:
+        start_time = time.perf_counter()
+        path = None
+        if format_type == SQL_FORMAT:
+            # Exercises COPY on PostgreSQL and LOAD DATA on MySQL
+            export_data(batches, "sql", SQL_TABLE, sql_url.split(":", 1)[0], sql_url)
+        elif format_type == "sqlite":
+            path = os.path.join(directory, "bench.db")
+            export_data(batches, "sql", "bench", "sqlite", f"sqlite:///{path}")
+        else:
+            file, _ = export_data(batches, format_type, "bench")
+            with file:
+                path = os.path.join(directory, f"bench.{FILE_EXTENSIONS[format_type]}")
+                with open(path, "wb") as f:
+                    while chunk := file.read(1024 * 1024):
+                        f.write(chunk)
+        seconds = time.perf_counter() - start_time
+        output_bytes = os.path.getsize(path) if path is not None else None
+    if format_type == SQL_FORMAT:
+        _drop_table(sql_url, SQL_TABLE)
+    peak_rss = _peak_rss()
+    return {
+        "model": model.name,
+        "format": format_type,
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds,
+        "output_bytes": output_bytes,
+        "rss_start": rss_start,
+        "peak_rss": peak_rss,
+        "export_rss_growth": peak_rss - rss_start if None not in (peak_rss, rss_start) else None,
+    }
+
+def bench_exports(
+    models: List[DataModel],
+    formats: List[str],
+    rows: int,
+    sql_url: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Export throughput and peak memory for each format, one process per case"""
+    if SQL_FORMAT in formats and not sql_url:
+        raise ValueError("The sql export case needs a database URL")
+    results = []
+    for model in models:
+        for format_type in formats:
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                results.append(executor.submit(_export_case, model, format_type, rows, sql_url).result())
+    return results
+
+def _int_list(value: str) -> List[int]:
+    return [int(item.replace("_", "")) for item in value.split(",")]
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmark", description="Generation and export benchmarks")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--suites", default="fields,generation,exports",
+                        help="Comma-separated subset of fields,generation,exports")
+    parser.add_argument("--field-rows", type=int)
+    parser.add_argument("--rows", type=_int_list, help="Row counts, e.g. 1000,100000")
+    parser.add_argument("--batch-sizes", type=_int_list)
+    parser.add_argument("--workers", type=_int_list)
+    parser.add_argument("--export-rows", type=int)
+    parser.add_argument("--formats", default=",".join(EXPORT_FORMATS),
+                        help=f"Comma-separated export formats; '{SQL_FORMAT}' loads into --sql-url")
+    parser.add_argument("--sql-url", help=f"Database for the {SQL_FORMAT} export case, e.g. postgresql://localhost/bench")
+    parser.add_argument("--repeat", type=int)
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON results file ('-' for stdout)")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    settings = dict(PROFILES[args.profile])
+    for key in ("field_rows", "rows", "batch_sizes", "workers", "export_rows", "repeat"):
+        if getattr(args, key) is not None:
+            settings[key] = getattr(args, key)
+    suites = args.suites.split(",")
+    formats = args.formats.split(",")
+    if SQL_FORMAT in formats and not args.sql_url:
+        build_parser().error(f"the {SQL_FORMAT} export format requires --sql-url")
+    models = _load_sample_models()
+
+    results: Dict[str, Any] = {"environment": _environment(), "profile": args.profile, "settings": settings}
+    if "fields" in suites:
+        print("Benchmarking field generators...", file=sys.stderr)
+        results["fields"] = bench_fields(settings["field_rows"], settings["repeat"])
+    if "generation" in suites:
+        print("Benchmarking model generation...", file=sys.stderr)
+        results["generation"] = bench_generation(
+            models, settings["rows"], settings["batch_sizes"], settings["workers"], settings["repeat"]
+        )
+    if "exports" in suites:
+        print("Benchmarking exports...", file=sys.stderr)
+        results["exports"] = bench_exports(models, formats, settings["export_rows"], args.sql_url)
+
+    payload = json.dumps(results, indent=2)
+    if args.output == "-":
+        print(payload)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload)
+        print(f"Results written to {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
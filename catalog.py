@@ -0,0 +1,274 @@
+import bisect
+import heapq
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from data_models import (
+    DataField, DataModel, _default_field_suggestions, _load_sample_models, _suggested_field_groups
+)
+
+# Directory of model definitions: JSON or YAML files holding one model or a list of models
+DEFAULT_CATALOG_DIR = os.environ.get("DATA_GENERATOR_MODELS_DIR", "models")
+MODEL_EXTENSIONS = (".json", ".yaml", ".yml")
+# Changed files are picked up on the next lookup after this many seconds
+RELOAD_INTERVAL_SECONDS = 2.0
+
+# Where a query token matched decides its weight in the ranking
+NAME_WEIGHT = 8.0
+TAG_WEIGHT = 4.0
+CATEGORY_WEIGHT = 3.0
+FIELD_NAME_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+# A token matched only as a prefix (search-as-you-type) counts for less than a whole word
+PREFIX_FACTOR = 0.5
+# Expanded query tokens kept between keystrokes until the index changes
+MATCH_CACHE_SIZE = 256
+SUGGESTION_LIMIT = 20
+
+_TOKEN = re.compile(r"[^\W_]+")
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words of a text; snake_case and punctuation split words"""
+    return _TOKEN.findall(text.lower())
+
+class InvertedIndex:
+    """Term -> {document id: weight} postings with sorted-vocabulary prefix lookup"""
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.terms: Dict[int, List[str]] = {}
+        self._vocabulary: Optional[List[str]] = None
+        self._match_cache: "OrderedDict[str, Dict[int, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def add(self, doc_id: int, weighted_texts: Iterable[Tuple[str, float]]):
+        weights: Dict[str, float] = {}
+        for text, weight in weighted_texts:
+            for term in tokenize(text):
+                weights[term] = weights.get(term, 0.0) + weight
+        for term, weight in weights.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                self._vocabulary = None
+            postings[doc_id] = weight
+        self.terms[doc_id] = list(weights)
+        self._match_cache.clear()
+
+    def remove(self, doc_id: int):
+        for term in self.terms.pop(doc_id, ()):
+            postings = self.postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self.postings[term]
+                self._vocabulary = None
+        self._match_cache.clear()
+
+    def _matches(self, token: str) -> Dict[int, float]:
+        """Scores for one query token: whole-word matches plus discounted prefix matches"""
+        scores = self._match_cache.get(token)
+        if scores is not None:
+            self._match_cache.move_to_end(token)
+            return scores
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocabulary = self._vocabulary
+        # Every term sharing the prefix is scored: short prefixes cost more but never lose matches
+        scores = dict(self.postings.get(token, {}))
+        start = bisect.bisect_right(vocabulary, token)
+        end = bisect.bisect_left(vocabulary, token + "\uffff", start)
+        for term in vocabulary[start:end]:
+            for doc_id, weight in self.postings[term].items():
+                scores[doc_id] = max(scores.get(doc_id, 0.0), weight * PREFIX_FACTOR)
+        self._match_cache[token] = scores
+        if len(self._match_cache) > MATCH_CACHE_SIZE:
+            self._match_cache.popitem(last=False)
+        return scores
+
+    def search(self, query: str, match_all: bool = True, limit: Optional[int] = None) -> List[int]:
+        """Document ids ranked by score, ties in insertion order; an empty query matches nothing"""
+        per_token = sorted((self._matches(token) for token in dict.fromkeys(tokenize(query))), key=len)
+        if not per_token:
+            return []
+        scores = dict(per_token[0])
+        for matches in per_token[1:]:
+            if match_all:
+                scores = {doc_id: score + matches[doc_id] for doc_id, score in scores.items() if doc_id in matches}
+            else:
+                for doc_id, score in matches.items():
+                    scores[doc_id] = scores.get(doc_id, 0.0) + score
+        if limit is not None:
+            return [doc_id for doc_id, _ in heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))]
+        return sorted(scores, key=lambda doc_id: (-scores[doc_id], doc_id))
+
+def _load_file(path: str) -> List[DataModel]:
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".json"):
+            content = json.load(f)
+        else:
+            try:
+                import yaml
+            except ImportError as e:
+                raise RuntimeError("Loading YAML models requires the 'pyyaml' package") from e
+            content = yaml.safe_load(f)
+    if isinstance(content, dict) and "models" in content:
+        content = content["models"]
+    if isinstance(content, dict):
+        content = [content]
+    if not isinstance(content, list):
+        raise ValueError("Expected a model, a list of models or {\"models\": [...]}")
+    return [DataModel.parse_obj(item) for item in content]
+
+class ModelCatalog:
+    """Built-in and file-backed models behind inverted indexes, reloaded file by file as files change"""
+
+    def __init__(self, directory: Optional[str] = DEFAULT_CATALOG_DIR, reload_interval: float = RELOAD_INTERVAL_SECONDS):
+        self.directory = directory
+        self.reload_interval = reload_interval
+        self.models: Dict[int, DataModel] = {}
+        self.fields: Dict[int, DataField] = {}
+        self.errors: Dict[str, str] = {}
+        self._model_index = InvertedIndex()
+        self._field_index = InvertedIndex()
+        # path -> (mtime_ns, size, model ids, field ids)
+        self._files: Dict[str, Tuple[int, int, List[int], List[int]]] = {}
+        self._next_id = 0
+        self._last_reload = 0.0
+        self._lock = threading.RLock()
+        self._add_builtins()
+
+    def _new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    def _add_field(self, field: DataField, context: Iterable[Tuple[str, float]]) -> int:
+        field_id = self._new_id()
+        self.fields[field_id] = field
+        self._field_index.add(field_id, [
+            (field.name, NAME_WEIGHT), (field.description, DESCRIPTION_WEIGHT), *context
+        ])
+        return field_id
+
+    def _add_model(self, model: DataModel) -> Tuple[int, List[int]]:
+        model_id = self._new_id()
+        self.models[model_id] = model
+        self._model_index.add(model_id, [
+            (model.name, NAME_WEIGHT),
+            (model.description, DESCRIPTION_WEIGHT),
+            (model.category, CATEGORY_WEIGHT),
+            *((tag, TAG_WEIGHT) for tag in model.tags),
+            *((field.name, FIELD_NAME_WEIGHT) for field in model.fields),
+            *((field.description, DESCRIPTION_WEIGHT) for field in model.fields),
+        ])
+        # A model's fields are suggested for searches on the model itself
+        context = [(model.name, TAG_WEIGHT), *((tag, TAG_WEIGHT) for tag in model.tags)]
+        return model_id, [self._add_field(field, context) for field in model.fields]
+
+    def _add_builtins(self):
+        for group, fields in _suggested_field_groups().items():
+            for field in fields:
+                self._add_field(field, [(group, NAME_WEIGHT)])
+        for model in _load_sample_models():
+            self._add_model(model)
+
+    def _remove_file(self, path: str):
+        _, _, model_ids, field_ids = self._files.pop(path)
+        for model_id in model_ids:
+            self._model_index.remove(model_id)
+            del self.models[model_id]
+        for field_id in field_ids:
+            self._field_index.remove(field_id)
+            del self.fields[field_id]
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        found = {}
+        if not self.directory or not os.path.isdir(self.directory):
+            return found
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.lower().endswith(MODEL_EXTENSIONS):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    found[path] = (stat.st_mtime_ns, stat.st_size)
+        return found
+
+    def reload(self, force: bool = False) -> int:
+        """Re-index files added, changed or removed since the last reload; returns how many"""
+        now = time.time()
+        with self._lock:
+            if not force and now - self._last_reload < self.reload_interval:
+                return 0
+            self._last_reload = now
+            found = self._scan()
+            changed = 0
+            for path in [path for path in self._files if path not in found]:
+                self._remove_file(path)
+                self.errors.pop(path, None)
+                changed += 1
+            for path in sorted(found):
+                mtime_ns, size = found[path]
+                if path in self._files and self._files[path][:2] == (mtime_ns, size):
+                    continue
+                if path in self._files:
+                    self._remove_file(path)
+                changed += 1
+                try:
+                    models = _load_file(path)
+                except Exception as e:
+                    # A broken file must not hide the rest of the catalog
+                    self.errors[path] = str(e)
+                    models = []
+                else:
+                    self.errors.pop(path, None)
+                model_ids, field_ids = [], []
+                for model in models:
+                    model_id, ids = self._add_model(model)
+                    model_ids.append(model_id)
+                    field_ids.extend(ids)
+                self._files[path] = (mtime_ns, size, model_ids, field_ids)
+            return changed
+
+    def __len__(self) -> int:
+        return len(self.models)
+
+    def search(self, query: str = "", limit: Optional[int] = None) -> List[DataModel]:
+        """Models matching every query word (the last may be partial), best first"""
+        self.reload()
+        with self._lock:
+            if not tokenize(query):
+                models = list(self.models.values())
+                return models[:limit] if limit is not None else models
+            return [self.models[model_id] for model_id in self._model_index.search(query, limit=limit)]
+
+    def suggest_fields(self, query: str, limit: int = SUGGESTION_LIMIT) -> List[DataField]:
+        """Fields matching any query word, best first, one per field name"""
+        self.reload()
+        with self._lock:
+            suggestions: Dict[str, DataField] = {}
+            for field_id in self._field_index.search(query, match_all=False):
+                field = self.fields[field_id]
+                suggestions.setdefault(field.name, field)
+                if len(suggestions) == limit:
+                    break
+        return list(suggestions.values()) or _default_field_suggestions()
+
+_catalog: Optional[ModelCatalog] = None
+_catalog_lock = threading.Lock()
+
+def get_catalog() -> ModelCatalog:
+    """Process-wide catalog, indexed on first use"""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = ModelCatalog()
+        return _catalog
@@ -0,0 +1,202 @@
+import argparse
+import json
+import os
+import sys
+import time
+from typing import List, Optional
+
+# --output s3://bucket/key.parquet uploads instead of writing a local file
+CLOUD_SCHEMES = {"s3": "s3", "gs": "gcs", "azure": "azure", "local": "local"}
+
+def _load_model(path: str):
+    from data_models import DataModel
+
+    with open(path, "r", encoding="utf-8") as f:
+        return DataModel.parse_obj(json.load(f))
+
+def _format_for(args: argparse.Namespace) -> str:
+    from exporter import format_for_path
+
+    if args.format:
+        return args.format
+    if args.output and format_for_path(args.output)[0]:
+        return format_for_path(args.output)[0]
+    raise SystemExit("Cannot infer the export format; pass --format")
+
+def _compression_for(args: argparse.Namespace) -> Optional[str]:
+    from exporter import format_for_path
+
+    if args.compression:
+        return args.compression
+    if args.output:
+        # data.csv.gz is gzip-compressed CSV
+        return format_for_path(args.output)[1]
+    return None
+
+def _generate(args: argparse.Namespace) -> int:
+    from generator import generate_data_iter
+    from exporter import export_data, format_for_path, write_export
+    from instrumentation import PerformanceReport
+
+    model = _load_model(args.model)
+    format_type = _format_for(args)
+    report = PerformanceReport() if args.report else None
+    batches = generate_data_iter(
+        model,
+        args.rows,
+        batch_size=args.batch_size,
+        seed=args.seed,
+        max_workers=args.workers,
+        report=report
+    )
+
+    start_time = time.time()
+    if format_type == "sql":
+        if not args.connection_string:
+            raise SystemExit("--connection-string is required for the sql format")
+        target = args.table or model.name
+        db_type = args.connection_string.split(":", 1)[0]
+        export_data(batches, "sql", target, db_type, args.connection_string, report=report)
+    elif not args.output:
+        raise SystemExit("--output is required for file formats")
+    elif args.output.partition("://")[0] in CLOUD_SCHEMES:
+        scheme, _, location = args.output.partition("://")
+        bucket, _, key = location.partition("/")
+        if format_for_path(key)[0] != format_type:
+            raise SystemExit("The object key's extension must match --format for cloud uploads")
+        _, target = export_data(
+            batches, "cloud", key, bucket_name=bucket, report=report, compression=_compression_for(args),
+            row_group_size=args.row_group_size, cloud_provider=CLOUD_SCHEMES[scheme]
+        )
+    else:
+        with open(args.output, "wb") as f:
+            write_export(batches, format_type, f, report, _compression_for(args), args.row_group_size)
+        target = args.output
+
+    print(f"Generated {args.rows:,} rows into {target} in {time.time() - start_time:.2f} seconds", file=sys.stderr)
+    if report is not None:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, indent=2)
+    return 0
+
+def _shards(args: argparse.Namespace) -> int:
+    from sharding import run_shards
+
+    model = _load_model(args.model)
+    start_time = time.time()
+    summary = run_shards(
+        model,
+        args.rows,
+        args.output_dir,
+        seed=args.seed,
+        shard_rows=args.shard_rows,
+        batch_size=args.batch_size,
+        max_workers=args.workers,
+        node_index=args.node_index,
+        node_count=args.node_count
+    )
+    print(
+        f"Wrote {summary['written']} and skipped {summary['skipped']} of this node's {summary['shards']} shards "
+        f"in {time.time() - start_time:.2f} seconds; {summary['complete']}/{summary['total']} complete",
+        file=sys.stderr
+    )
+    return 0
+
+def _load_dataset(path: str):
+    from data_models import Dataset, _load_sample_datasets
+
+    if not os.path.exists(path):
+        for dataset in _load_sample_datasets():
+            if dataset.name == path:
+                return dataset
+    with open(path, "r", encoding="utf-8") as f:
+        return Dataset.parse_obj(json.load(f))
+
+def _dataset(args: argparse.Namespace) -> int:
+    from relational import export_dataset
+
+    dataset = _load_dataset(args.dataset)
+    target = args.connection_string if args.format == "sql" else args.output_dir
+    if not target:
+        raise SystemExit("--connection-string is required for sql, --output-dir for file formats")
+
+    start_time = time.time()
+    outputs = export_dataset(dataset, args.format, target, args.seed, args.batch_size, args.workers)
+    for model_name, output in outputs.items():
+        print(f"{model_name}: {output}", file=sys.stderr)
+    print(f"Generated {len(outputs)} tables in {time.time() - start_time:.2f} seconds", file=sys.stderr)
+    return 0
+
+def _profile(args: argparse.Namespace) -> int:
+    from profiler import profile_file
+
+    start_time = time.time()
+    model = profile_file(args.path, format_type=args.format, name=args.name, batch_rows=args.batch_size)
+    text = json.dumps(model.dict(), indent=2, default=str)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    print(
+        f"Profiled {model.schema['rows']} rows and {len(model.fields)} columns in {time.time() - start_time:.2f} seconds",
+        file=sys.stderr
+    )
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Headless data generation")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate = subparsers.add_parser("generate", help="Generate data from a model JSON file")
+    generate.add_argument("model", help="Path to a DataModel JSON file")
+    generate.add_argument("--rows", type=int, default=1000)
+    generate.add_argument("--batch-size", type=int, default=10000)
+    generate.add_argument("--seed", type=int, default=None)
+    generate.add_argument("--workers", type=int, default=1)
+    generate.add_argument("--format", choices=["csv", "excel", "json", "ndjson", "parquet", "sql"])
+    generate.add_argument("--compression", help="gzip or zstd for csv/ndjson, a codec for parquet (default: from the file name)")
+    generate.add_argument("--row-group-size", type=int, help="Rows per Parquet row group")
+    generate.add_argument("--output", help="Output file for file formats, or s3://, gs://, azure:// or local:// bucket/key")
+    generate.add_argument("--connection-string", help="SQLAlchemy URL for the sql format")
+    generate.add_argument("--table", help="Target table for the sql format (defaults to the model name)")
+    generate.add_argument("--report", help="Write a JSON performance report to this path")
+    generate.set_defaults(handler=_generate)
+
+    shards = subparsers.add_parser("shards", help="Generate a job as numbered Parquet parts with a manifest")
+    shards.add_argument("model", help="Path to a DataModel JSON file")
+    shards.add_argument("--rows", type=int, required=True)
+    shards.add_argument("--output-dir", required=True)
+    shards.add_argument("--shard-rows", type=int, default=1000000)
+    shards.add_argument("--batch-size", type=int, default=10000)
+    shards.add_argument("--seed", type=int, default=None, help="Defaults to the seed stored in an existing manifest")
+    shards.add_argument("--workers", type=int, default=1)
+    shards.add_argument("--node-index", type=int, default=0, help="This machine's index when splitting shards")
+    shards.add_argument("--node-count", type=int, default=1, help="Number of machines sharing the job")
+    shards.set_defaults(handler=_shards)
+
+    dataset = subparsers.add_parser("dataset", help="Generate related tables from a Dataset JSON file")
+    dataset.add_argument("dataset", help="Path to a Dataset JSON file or the name of a sample dataset")
+    dataset.add_argument("--batch-size", type=int, default=10000)
+    dataset.add_argument("--seed", type=int, default=None)
+    dataset.add_argument("--workers", type=int, default=1)
+    dataset.add_argument("--format", choices=["csv", "excel", "json", "ndjson", "parquet", "sql"], default="parquet")
+    dataset.add_argument("--output-dir", help="Directory for file formats, one file per table")
+    dataset.add_argument("--connection-string", help="SQLAlchemy URL for the sql format")
+    dataset.set_defaults(handler=_dataset)
+
+    profile = subparsers.add_parser("profile", help="Fit a DataModel JSON file from an existing CSV or Parquet file")
+    profile.add_argument("path", help="CSV (optionally .gz/.zst) or Parquet file to profile")
+    profile.add_argument("--format", choices=["csv", "parquet"], help="Defaults to the file extension")
+    profile.add_argument("--name", help="Model name (defaults to the file name)")
+    profile.add_argument("--batch-size", type=int, default=65536, help="Rows read per Parquet batch")
+    profile.add_argument("--output", help="Write the model JSON here instead of stdout")
+    profile.set_defaults(handler=_profile)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
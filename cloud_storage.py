@@ -0,0 +1,301 @@
+import base64
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+# S3 rejects parts under 5 MiB (except the last), so parts default comfortably above it
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+# At most this many parts are buffered or uploading at once: memory stays near
+# (max_in_flight + 1) * part_size whatever the size of the export
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 0.5
+
+DEFAULT_LOCAL_ROOT = os.environ.get(
+    "DATA_GENERATOR_LOCAL_STORAGE", os.path.join(tempfile.gettempdir(), "data_generator_storage")
+)
+
+class StorageBackend(ABC):
+    """Multipart upload protocol every provider implements"""
+
+    name = "storage"
+
+    @abstractmethod
+    def start(self, key: str) -> str:
+        """Begin an upload and return its id"""
+
+    @abstractmethod
+    def upload_part(self, upload_id: str, key: str, part_number: int, data: bytes) -> Any:
+        """Store one part (numbered from 1) and return the token needed to complete the upload"""
+
+    @abstractmethod
+    def complete(self, upload_id: str, key: str, parts: List[Any]):
+        """Assemble the uploaded parts, in order, into the final object"""
+
+    @abstractmethod
+    def abort(self, upload_id: str, key: str):
+        """Discard an unfinished upload"""
+
+    def url(self, key: str) -> str:
+        return f"{self.name}://{key}"
+
+class LocalBackend(StorageBackend):
+    """Filesystem stand-in for an object store, for local runs and testing"""
+
+    name = "file"
+
+    def __init__(self, bucket: str, root: str = DEFAULT_LOCAL_ROOT):
+        self.directory = os.path.join(root, bucket)
+
+    def _upload_dir(self, upload_id: str) -> str:
+        return os.path.join(self.directory, ".uploads", upload_id)
+
+    def start(self, key: str) -> str:
+        upload_id = uuid.uuid4().hex
+        os.makedirs(self._upload_dir(upload_id))
+        return upload_id
+
+    def upload_part(self, upload_id: str, key: str, part_number: int, data: bytes) -> str:
+        path = os.path.join(self._upload_dir(upload_id), f"part-{part_number:05d}")
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def complete(self, upload_id: str, key: str, parts: List[str]):
+        path = os.path.join(self.directory, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = os.path.join(self._upload_dir(upload_id), "object")
+        with open(temp_path, "wb") as out:
+            for part in parts:
+                with open(part, "rb") as f:
+                    shutil.copyfileobj(f, out)
+        os.replace(temp_path, path)
+        self.abort(upload_id, key)
+
+    def abort(self, upload_id: str, key: str):
+        shutil.rmtree(self._upload_dir(upload_id), ignore_errors=True)
+
+    def url(self, key: str) -> str:
+        return f"file://{os.path.join(self.directory, key)}"
+
+def _require(module: str, package: str):
+    try:
+        return __import__(module, fromlist=["_"])
+    except ImportError as e:
+        raise RuntimeError(f"Uploading to this provider requires the '{package}' package") from e
+
+class S3Backend(StorageBackend):
+    """Amazon S3 multipart upload; credentials come from the usual boto3 chain"""
+
+    name = "s3"
+
+    def __init__(self, bucket: str, client: Any = None):
+        self.bucket = bucket
+        self.client = client or _require("boto3", "boto3").client("s3")
+
+    def start(self, key: str) -> str:
+        return self.client.create_multipart_upload(Bucket=self.bucket, Key=key)["UploadId"]
+
+    def upload_part(self, upload_id: str, key: str, part_number: int, data: bytes) -> Dict[str, Any]:
+        response = self.client.upload_part(
+            Bucket=self.bucket, Key=key, UploadId=upload_id, PartNumber=part_number, Body=data
+        )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+    def complete(self, upload_id: str, key: str, parts: List[Dict[str, Any]]):
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+        )
+
+    def abort(self, upload_id: str, key: str):
+        self.client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
+
+    def url(self, key: str) -> str:
+        return f"s3://{self.bucket}/{key}"
+
+# GCS composes at most 32 objects per request
+GCS_COMPOSE_LIMIT = 32
+
+class GCSBackend(StorageBackend):
+    """Google Cloud Storage: parts are temporary objects composed into the final one"""
+
+    name = "gs"
+
+    def __init__(self, bucket: str, client: Any = None):
+        client = client or _require("google.cloud.storage", "google-cloud-storage").Client()
+        self.bucket = client.bucket(bucket)
+
+    def _part_name(self, upload_id: str, key: str, part_number: int) -> str:
+        return f"{key}.parts/{upload_id}/{part_number:05d}"
+
+    def start(self, key: str) -> str:
+        return uuid.uuid4().hex
+
+    def upload_part(self, upload_id: str, key: str, part_number: int, data: bytes) -> str:
+        name = self._part_name(upload_id, key, part_number)
+        self.bucket.blob(name).upload_from_string(data)
+        return name
+
+    def complete(self, upload_id: str, key: str, parts: List[str]):
+        # Compose in rounds of up to 32 sources until a single object remains
+        blobs = [self.bucket.blob(name) for name in parts]
+        temporary = list(blobs)
+        round_num = 0
+        while len(blobs) > GCS_COMPOSE_LIMIT:
+            merged = []
+            for index in range(0, len(blobs), GCS_COMPOSE_LIMIT):
+                target = self.bucket.blob(f"{key}.parts/{upload_id}/r{round_num}-{index:05d}")
+                target.compose(blobs[index:index + GCS_COMPOSE_LIMIT])
+                merged.append(target)
+            temporary.extend(merged)
+            blobs = merged
+            round_num += 1
+        self.bucket.blob(key).compose(blobs)
+        for blob in temporary:
+            blob.delete()
+
+    def abort(self, upload_id: str, key: str):
+        for blob in self.bucket.client.list_blobs(self.bucket, prefix=f"{key}.parts/{upload_id}/"):
+            blob.delete()
+
+    def url(self, key: str) -> str:
+        return f"gs://{self.bucket.name}/{key}"
+
+class AzureBackend(StorageBackend):
+    """Azure Blob block upload; the connection string defaults to AZURE_STORAGE_CONNECTION_STRING"""
+
+    name = "azure"
+
+    def __init__(self, container: str, connection_string: Optional[str] = None, client: Any = None):
+        if client is None:
+            blob = _require("azure.storage.blob", "azure-storage-blob")
+            connection_string = connection_string or os.environ.get("AZURE_STORAGE_CONNECTION_STRING")
+            if not connection_string:
+                raise RuntimeError("Set AZURE_STORAGE_CONNECTION_STRING to upload to Azure Blob")
+            client = blob.BlobServiceClient.from_connection_string(connection_string)
+        self.container = client.get_container_client(container)
+
+    def start(self, key: str) -> str:
+        return uuid.uuid4().hex
+
+    def upload_part(self, upload_id: str, key: str, part_number: int, data: bytes) -> str:
+        # Block ids must all have the same length within a blob
+        block_id = base64.b64encode(f"{upload_id}-{part_number:05d}".encode()).decode()
+        self.container.get_blob_client(key).stage_block(block_id, data)
+        return block_id
+
+    def complete(self, upload_id: str, key: str, parts: List[str]):
+        self.container.get_blob_client(key).commit_block_list(parts)
+
+    def abort(self, upload_id: str, key: str):
+        # Uncommitted blocks are garbage-collected by the service
+        pass
+
+    def url(self, key: str) -> str:
+        return f"azure://{self.container.container_name}/{key}"
+
+_BACKENDS = {
+    "local": LocalBackend,
+    "s3": S3Backend,
+    "aws s3": S3Backend,
+    "gcs": GCSBackend,
+    "google cloud storage": GCSBackend,
+    "azure": AzureBackend,
+    "azure blob": AzureBackend,
+}
+
+def get_backend(provider: str, bucket: str, **options: Any) -> StorageBackend:
+    """Backend for a provider name, e.g. 's3' or the UI label 'AWS S3'"""
+    backend = _BACKENDS.get(provider.lower())
+    if backend is None:
+        raise ValueError(f"Unsupported storage provider: {provider}")
+    if not bucket:
+        raise ValueError("A bucket or container name is required")
+    return backend(bucket, **options)
+
+class MultipartWriter:
+    """Write-only file object that uploads fixed-size parts concurrently while the caller writes"""
+
+    def __init__(
+        self,
+        backend: StorageBackend,
+        key: str,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        max_retries: int = DEFAULT_MAX_RETRIES
+    ):
+        self.backend = backend
+        self.key = key
+        self.part_size = part_size
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_retries = max_retries
+        self.upload_id = backend.start(key)
+        self.buffer = bytearray()
+        self.position = 0
+        self.parts: List[Any] = []
+        self.pending: "deque[Future]" = deque()
+        self.executor = ThreadPoolExecutor(self.max_in_flight, thread_name_prefix="upload")
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.buffer += data
+        self.position += len(data)
+        while len(self.buffer) >= self.part_size:
+            self._submit(bytes(self.buffer[:self.part_size]))
+            del self.buffer[:self.part_size]
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def seekable(self) -> bool:
+        return False
+
+    def flush(self):
+        pass
+
+    def _upload(self, part_number: int, data: bytes) -> Any:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.backend.upload_part(self.upload_id, self.key, part_number, data)
+            except Exception:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(RETRY_BACKOFF_SECONDS * 2 ** attempt)
+
+    def _submit(self, data: bytes):
+        # Wait for the oldest part before buffering more than max_in_flight
+        while len(self.pending) >= self.max_in_flight:
+            self.parts.append(self.pending.popleft().result())
+        part_number = len(self.parts) + len(self.pending) + 1
+        self.pending.append(self.executor.submit(self._upload, part_number, data))
+
+    def close(self):
+        """Upload the last part and assemble the object"""
+        if self.closed:
+            return
+        try:
+            if self.buffer or not self.parts and not self.pending:
+                self._submit(bytes(self.buffer))
+                self.buffer = bytearray()
+            while self.pending:
+                self.parts.append(self.pending.popleft().result())
+            self.backend.complete(self.upload_id, self.key, self.parts)
+        except BaseException:
+            self.abort()
+            raise
+        self.closed = True
+        self.executor.shutdown()
+
+    def abort(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.executor.shutdown(cancel_futures=True)
+        self.backend.abort(self.upload_id, self.key)
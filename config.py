@@ -1,7 +1,7 @@
 import json
-import streamlit as st
+from functools import lru_cache
 
-@st.cache_data
+@lru_cache(maxsize=None)
 def load_translations():
     """تحميل ملفات الترجمة مع التخزين المؤقت"""
     try:
@@ -12,6 +12,7 @@ def load_translations():
 
 def setup_language():
     """تهيئة إعدادات اللغة"""
+    import streamlit as st
     if "language" not in st.session_state:
         st.session_state.language = "en"
     return st.session_state.language
@@ -24,6 +25,7 @@ def get_translation(lang: str, key: str) -> str:
 
 def switch_language():
     """تبديل اللغة بين الإنجليزية والعربية"""
+    import streamlit as st
     if "language" not in st.session_state:
         st.session_state.language = "en"
     else:
@@ -1,8 +1,7 @@
 from pydantic import BaseModel, Field, validator
 from typing import List, Dict, Any, Optional
 from enum import Enum
-import pandas as pd
-import streamlit as st
+from functools import lru_cache
 
 class FieldType(str, Enum):
     UUID = "uuid"
@@ -15,6 +14,7 @@ class FieldType(str, Enum):
     DATE = "date"
     DATETIME = "datetime"
     CATEGORY = "category"
+    PATTERN = "pattern"
 
 class DataField(BaseModel):
     name: str
@@ -31,8 +31,9 @@ class DataField(BaseModel):
             return [values.get('type', FieldType.STRING)]
         return v
     
-    def copy(self, **kwargs):
-        return self.__class__(**{**self.dict(), **kwargs})
+    def copy(self, update: Optional[Dict[str, Any]] = None, **kwargs):
+        """Validated copy with changed values, given as keywords or pydantic's update mapping"""
+        return self.__class__(**{**self.dict(), **(update or {}), **kwargs})
 
 class DataModel(BaseModel):
     name: str
@@ -54,10 +55,33 @@ class DataModel(BaseModel):
         self.fields = [f for f in self.fields if f.name != field_name]
         return self
 
-@st.cache_data
-def suggest_fields(search_term: str) -> List[DataField]:
-    """Suggest relevant fields based on search terms"""
-    suggestions = {
+class ForeignKey(BaseModel):
+    """Link from a child field to a key field of a parent model in the same dataset"""
+    model: str
+    field: str
+    parent_model: str
+    parent_field: str
+    fanout: Optional[float] = None
+    skew: float = 0.0
+
+class Dataset(BaseModel):
+    """Several related data models generated together"""
+    name: str
+    description: str = ""
+    models: List[DataModel]
+    foreign_keys: List[ForeignKey] = Field(default_factory=list)
+    rows: Dict[str, int] = Field(default_factory=dict)
+
+    def get_model(self, name: str) -> DataModel:
+        for model in self.models:
+            if model.name == name:
+                return model
+        raise ValueError(f"Dataset '{self.name}' has no model named '{name}'")
+
+@lru_cache(maxsize=None)
+def _suggested_field_groups() -> Dict[str, List[DataField]]:
+    """Built-in field suggestions keyed by the subject they belong to"""
+    return {
         "customer": [
             DataField(name="customer_id", description="Unique customer identifier", type=FieldType.UUID),
             DataField(name="name", description="Customer full name", type=FieldType.NAME),
@@ -68,35 +92,37 @@ def suggest_fields(search_term: str) -> List[DataField]:
         "product": [
             DataField(name="product_id", description="Product identifier", type=FieldType.INTEGER),
             DataField(name="product_name", description="Product name", type=FieldType.STRING),
+            DataField(name="sku", description="Stock keeping unit", type=FieldType.PATTERN,
+                      unique=True, options={"pattern": "SKU-???-#####"}),
             DataField(name="price", description="Product price", type=FieldType.FLOAT, options={"min": 0}),
             DataField(name="category", description="Product category", type=FieldType.CATEGORY)
         ],
         "transaction": [
             DataField(name="transaction_id", description="Transaction identifier", type=FieldType.UUID),
+            DataField(name="order_number", description="Formatted order number", type=FieldType.PATTERN,
+                      unique=True, options={"pattern": "ORD-2026-######"}),
             DataField(name="amount", description="Transaction amount", type=FieldType.FLOAT),
             DataField(name="date", description="Transaction date", type=FieldType.DATE),
             DataField(name="status", description="Transaction status", type=FieldType.CATEGORY)
         ]
     }
-    
-    search_term = search_term.lower()
-    suggested_fields = []
-    
-    for key, fields in suggestions.items():
-        if key in search_term:
-            suggested_fields.extend(fields)
-    
-    # Add some general fields if no specific matches
-    if not suggested_fields:
-        suggested_fields.extend([
-            DataField(name="id", description="Unique identifier", type=FieldType.UUID),
-            DataField(name="created_at", description="Creation timestamp", type=FieldType.DATETIME),
-            DataField(name="updated_at", description="Last update timestamp", type=FieldType.DATETIME)
-        ])
-    
-    return suggested_fields
 
-@st.cache_data
+@lru_cache(maxsize=None)
+def _default_field_suggestions() -> List[DataField]:
+    """General fields suggested when nothing matches"""
+    return [
+        DataField(name="id", description="Unique identifier", type=FieldType.UUID),
+        DataField(name="created_at", description="Creation timestamp", type=FieldType.DATETIME),
+        DataField(name="updated_at", description="Last update timestamp", type=FieldType.DATETIME)
+    ]
+
+def suggest_fields(search_term: str) -> List[DataField]:
+    """Suggest relevant fields based on search terms"""
+    from catalog import get_catalog
+
+    return get_catalog().suggest_fields(search_term)
+
+@lru_cache(maxsize=None)
 def _load_sample_models() -> List[DataModel]:
     """Load sample data models with enhanced examples"""
     models = [
@@ -110,7 +136,7 @@ def _load_sample_models() -> List[DataModel]:
                     name="customer_id",
                     description="Unique customer identifier",
                     type=FieldType.UUID,
-                    available_types=[FieldType.UUID, FieldType.INTEGER, FieldType.STRING]
+                    available_types=[FieldType.UUID, FieldType.INTEGER, FieldType.STRING, FieldType.PATTERN]
                 ),
                 DataField(
                     name="name",
@@ -143,7 +169,7 @@ def _load_sample_models() -> List[DataModel]:
                     name="product_id",
                     description="Product identifier",
                     type=FieldType.INTEGER,
-                    available_types=[FieldType.INTEGER, FieldType.STRING]
+                    available_types=[FieldType.INTEGER, FieldType.STRING, FieldType.PATTERN]
                 ),
                 DataField(
                     name="product_name",
@@ -163,34 +189,48 @@ def _load_sample_models() -> List[DataModel]:
     ]
     return models
 
-@st.cache_data
-def get_available_models(search_term: str = "") -> List[DataModel]:
-    """Get available data models with enhanced search functionality"""
-    all_models = _load_sample_models()
-    
-    if not search_term:
-        return all_models
-    
-    search_term = search_term.lower()
-    results = []
-    
-    for model in all_models:
-        # Search in name, description, category
-        if (search_term in model.name.lower() or 
-            search_term in model.description.lower() or 
-            search_term in model.category.lower()):
-            results.append(model)
-            continue
-        
-        # Search in tags
-        if any(search_term in tag.lower() for tag in model.tags):
-            results.append(model)
-            continue
-        
-        # Search in field names and descriptions
-        if any(search_term in field.name.lower() or 
-               search_term in field.description.lower() 
-               for field in model.fields):
-            results.append(model)
-    
-    return results
+@lru_cache(maxsize=None)
+def _load_sample_datasets() -> List[Dataset]:
+    """Load sample multi-table datasets built on the sample models"""
+    customers, products = _load_sample_models()
+    products = products.copy(update={"fields": [
+        field.copy(unique=True, options={"min": 1, "max": 10000000})
+        if field.name == "product_id" else field
+        for field in products.fields
+    ]})
+    transactions = DataModel(
+        name="Transaction Data",
+        description="Purchases linking customers to products",
+        category="E-commerce",
+        tags=["transaction", "order", "sales"],
+        fields=[
+            DataField(name="transaction_id", description="Transaction identifier", type=FieldType.UUID),
+            DataField(name="customer_id", description="Purchasing customer", type=FieldType.UUID),
+            DataField(name="product_id", description="Purchased product", type=FieldType.INTEGER),
+            DataField(name="amount", description="Transaction amount", type=FieldType.FLOAT,
+                      options={"min": 1, "max": 5000}),
+            DataField(name="date", description="Transaction date", type=FieldType.DATE),
+            DataField(name="status", description="Transaction status", type=FieldType.CATEGORY,
+                      options={"categories": ["completed", "pending", "refunded"]})
+        ]
+    )
+    return [
+        Dataset(
+            name="Retail",
+            description="Customers, products and their transactions",
+            models=[customers, products, transactions],
+            foreign_keys=[
+                ForeignKey(model="Transaction Data", field="customer_id",
+                           parent_model="Customer Data", parent_field="customer_id", fanout=5.0, skew=1.0),
+                ForeignKey(model="Transaction Data", field="product_id",
+                           parent_model="Product Data", parent_field="product_id", skew=1.2)
+            ],
+            rows={"Customer Data": 10000, "Product Data": 1000}
+        )
+    ]
+
+def get_available_models(search_term: str = "", limit: Optional[int] = None) -> List[DataModel]:
+    """Get available data models, ranked by relevance to the search term"""
+    from catalog import get_catalog
+
+    return get_catalog().search(search_term, limit)
@@ -0,0 +1,148 @@
+import glob
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import BinaryIO, Iterable, Iterator, List, Optional
+
+import pyarrow as pa
+
+DEFAULT_STORE_DIR = os.environ.get(
+    "DATA_GENERATOR_STORE_DIR", os.path.join(tempfile.gettempdir(), "data_generator_datasets")
+)
+# Files untouched for this long are removed; every read refreshes the clock
+DEFAULT_TTL_SECONDS = int(os.environ.get("DATA_GENERATOR_DATASET_TTL", str(24 * 3600)))
+CLEANUP_INTERVAL_SECONDS = 300
+
+class DatasetHandle:
+    """Small, session-safe reference to a generated dataset stored as an Arrow IPC stream file"""
+
+    def __init__(self, key: str, path: str, num_rows: int, schema: pa.Schema):
+        self.key = key
+        self.path = path
+        self.num_rows = num_rows
+        self.schema = schema
+
+    @property
+    def column_names(self) -> List[str]:
+        return self.schema.names
+
+    @property
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def read(self) -> pa.Table:
+        """Zero-copy table over the memory-mapped file; pages load only when touched"""
+        _touch(self.path)
+        with pa.memory_map(self.path, "r") as source:
+            return pa.ipc.open_stream(source).read_all()
+
+    def head(self, k: int = 50) -> pa.Table:
+        return self.read().slice(0, k)
+
+    def iter_batches(self, max_chunksize: Optional[int] = None) -> Iterator[pa.RecordBatch]:
+        return iter(self.read().to_batches(max_chunksize=max_chunksize))
+
+def _touch(path: str):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+class DatasetStore:
+    """Arrow IPC files on local disk keyed by generation fingerprint, expired by TTL"""
+
+    def __init__(self, directory: str = DEFAULT_STORE_DIR, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self._last_cleanup = 0.0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.arrow")
+
+    def get(self, key: str) -> Optional[DatasetHandle]:
+        """Handle to a stored dataset, or None when it was never written or has expired"""
+        self.cleanup()
+        path = self._path(key)
+        try:
+            with pa.memory_map(path, "r") as source:
+                table = pa.ipc.open_stream(source).read_all()
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return None
+        _touch(path)
+        return DatasetHandle(key, path, table.num_rows, table.schema)
+
+    def write(self, key: str, batches: Iterable[pa.RecordBatch], schema: pa.Schema) -> DatasetHandle:
+        """Stream batches into the store; the file appears only once complete"""
+        self.cleanup()
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        num_rows = 0
+        try:
+            # The stream format, unlike the file format, allows each batch its own dictionaries
+            with pa.OSFile(temp_path, "wb") as sink, pa.ipc.new_stream(sink, schema) as writer:
+                for batch in batches:
+                    writer.write_batch(batch)
+                    num_rows += batch.num_rows
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return DatasetHandle(key, path, num_rows, schema)
+
+    def _file_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.download")
+
+    def get_file(self, key: str) -> Optional[str]:
+        """Path of a stored download, or None when it was never written or has expired"""
+        self.cleanup()
+        path = self._file_path(key)
+        if not os.path.exists(path):
+            return None
+        _touch(path)
+        return path
+
+    def write_file(self, key: str, source: BinaryIO) -> str:
+        """Copy an exported file into the store for download; expires like datasets"""
+        self.cleanup()
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._file_path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                shutil.copyfileobj(source, f)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return path
+
+    def cleanup(self, force: bool = False) -> int:
+        """Remove files idle for longer than the TTL; cheap to call often"""
+        now = time.time()
+        with self._lock:
+            if not force and now - self._last_cleanup < CLEANUP_INTERVAL_SECONDS:
+                return 0
+            self._last_cleanup = now
+        removed = 0
+        patterns = ("*.arrow", "*.download", "*.tmp")
+        for path in [path for pattern in patterns for path in glob.glob(os.path.join(self.directory, pattern))]:
+            try:
+                if now - os.path.getmtime(path) > self.ttl_seconds:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                # Already removed by another process, or still mapped on platforms that forbid it
+                pass
+        return removed
+
+_store = DatasetStore()
+
+def get_store() -> DatasetStore:
+    """Process-wide dataset store shared by all sessions"""
+    return _store
@@ -1,77 +1,747 @@
-import pandas as pd
 import numpy as np
-from typing import Dict, Any, Optional, Callable
-from data_models import DataModel, DataField  # Added DataField import
-import random
-from faker import Faker
-import uuid
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import TYPE_CHECKING, Dict, Any, Optional, Callable, Iterator, List, NamedTuple, Tuple
+from data_models import DataModel, DataField, FieldType
+from collections import OrderedDict
+from functools import partial
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
-
-fake = Faker()
-
-def generate_field_data(field: DataField, batch_size: int) -> list:
-    """Generate data for a single field efficiently"""
-    if field.type == "uuid":
-        return [str(uuid.uuid4()) for _ in range(batch_size)]
-    elif field.type == "name":
-        return [fake.name() for _ in range(batch_size)]
-    elif field.type == "email":
-        return [fake.email() for _ in range(batch_size)]
-    elif field.type == "integer":
-        if hasattr(field, 'options') and field.options:
-            min_val = field.options.get('min', 0)
-            max_val = field.options.get('max', 100)
-            return np.random.randint(min_val, max_val, batch_size).tolist()
-        return np.random.randint(0, 100, batch_size).tolist()
-    elif field.type == "float":
-        if hasattr(field, 'options') and field.options:
-            min_val = field.options.get('min', 0)
-            max_val = field.options.get('max', 100)
-            return np.round(np.random.uniform(min_val, max_val, batch_size), 2).tolist()
-        return np.round(np.random.uniform(0, 100, batch_size), 2).tolist()
-    return ["" for _ in range(batch_size)]
+import zlib
+import pools
+import scheduler
+from instrumentation import PerformanceReport, current_rss
+from permutation import FeistelPermutation, blocked_permutation, permutation_key
+from patterns import CompiledPattern, compile_pattern
+from result_cache import fingerprint
 
-def generate_data(
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_MIN = 0
+DEFAULT_MAX = 100
+DEFAULT_DECIMALS = 2
+DEFAULT_STRING_LENGTH = 10
+DEFAULT_DATE_RANGE = ("2020-01-01", "2025-12-31")
+DEFAULT_CATEGORIES = ["A", "B", "C", "D"]
+DEFAULT_NULL_RATE = 0.1
+DEFAULT_PATTERN = "???-#####"
+
+_ALPHANUMERIC = np.frombuffer(b"abcdefghijklmnopqrstuvwxyz0123456789", dtype=np.uint8)
+# Two ASCII hex digits for every byte value, looked up in a single gather
+_HEX_PAIRS = np.array(
+    [int.from_bytes(f"{value:02x}".encode(), "little") for value in range(256)], dtype="<u2"
+)
+UUID_STORAGE_STRING = "string"
+UUID_STORAGE_BINARY = "binary"
+
+def _fixed_width_strings(buffer: np.ndarray, validity: Optional[pa.Buffer] = None) -> pa.Array:
+    """Wrap an (n, width) uint8 buffer as an Arrow string array without per-row copies"""
+    rows, width = buffer.shape
+    offsets = np.arange(0, (rows + 1) * width, width, dtype=np.int32)
+    data = np.ascontiguousarray(buffer, dtype=np.uint8)
+    return pa.Array.from_buffers(
+        pa.string(), rows, [validity, pa.py_buffer(offsets), pa.py_buffer(data)]
+    )
+
+def uuid4_bytes(rng: np.random.Generator, size: int) -> np.ndarray:
+    """Draw version-4 UUIDs as an (n, 16) byte matrix from one bulk random buffer"""
+    raw = np.frombuffer(bytearray(rng.bytes(size * 16)), dtype=np.uint8).reshape(size, 16)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # version 4
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+    return raw
+
+def _uuid_string_buffer(raw: np.ndarray) -> np.ndarray:
+    """Format an (n, 16) byte matrix as (n, 36) canonical UUID characters"""
+    digits = _HEX_PAIRS[raw].view(np.uint8).reshape(len(raw), 32)
+    buffer = np.full((len(raw), 36), ord("-"), dtype=np.uint8)
+    buffer[:, 0:8] = digits[:, 0:8]
+    buffer[:, 9:13] = digits[:, 8:12]
+    buffer[:, 14:18] = digits[:, 12:16]
+    buffer[:, 19:23] = digits[:, 16:20]
+    buffer[:, 24:36] = digits[:, 20:32]
+    return buffer
+
+def uuid_bytes_to_strings(values: pa.FixedSizeBinaryArray) -> pa.Array:
+    """Convert binary(16) UUIDs to canonical strings, keeping nulls"""
+    raw = np.frombuffer(values.buffers()[1], dtype=np.uint8)
+    raw = raw[values.offset * 16:(values.offset + len(values)) * 16].reshape(len(values), 16)
+    validity = None
+    if values.null_count:
+        validity = pc.is_valid(values).buffers()[1]
+    return _fixed_width_strings(_uuid_string_buffer(raw), validity)
+
+# Column kernels take options already resolved by the compile step, so a batch
+# only runs vectorized draws: kernel(batch_size, rng, start) -> Arrow array
+Kernel = Callable[[int, np.random.Generator, int], pa.Array]
+
+def _uuid_kernel(binary: bool, batch_size: int, rng: np.random.Generator, start: int = 0) -> pa.Array:
+    raw = uuid4_bytes(rng, batch_size)
+    if binary:
+        return pa.FixedSizeBinaryArray.from_buffers(
+            pa.binary(16), batch_size, [None, pa.py_buffer(raw)]
+        )
+    return _fixed_width_strings(_uuid_string_buffer(raw))
+
+def _integer_kernel(low: int, high: int, batch_size: int, rng: np.random.Generator, start: int = 0) -> pa.Array:
+    return pa.array(rng.integers(low, high, batch_size, dtype=np.int64))
+
+def _float_kernel(low: float, high: float, decimals: int, batch_size: int, rng: np.random.Generator, start: int = 0) -> pa.Array:
+    return pa.array(np.round(rng.uniform(low, high, batch_size), decimals))
+
+def _quantile_kernel(
+    quantiles: np.ndarray, decimals: Optional[int],
+    batch_size: int, rng: np.random.Generator, start: int = 0
+) -> pa.Array:
+    # Inverse-CDF sampling through evenly spaced quantiles, e.g. from a profiled column
+    values = np.interp(rng.random(batch_size), np.linspace(0, 1, len(quantiles)), quantiles)
+    if decimals is None:
+        return pa.array(np.floor(values + 0.5).astype(np.int64))
+    return pa.array(np.round(values, decimals))
+
+def _string_kernel(length: int, batch_size: int, rng: np.random.Generator, start: int = 0) -> pa.Array:
+    indices = rng.integers(0, len(_ALPHANUMERIC), (batch_size, length))
+    return _fixed_width_strings(_ALPHANUMERIC[indices])
+
+def _boolean_kernel(probability: float, batch_size: int, rng: np.random.Generator, start: int = 0) -> pa.Array:
+    return pa.array(rng.random(batch_size) < probability)
+
+def _datetime_kernel(
+    first: np.datetime64, count: int, unit: str, arrow_type: pa.DataType,
+    batch_size: int, rng: np.random.Generator, start: int = 0
+) -> pa.Array:
+    offsets = rng.integers(0, count, batch_size)
+    return pa.array(first + offsets.astype(f"timedelta64[{unit}]"), type=arrow_type)
+
+def _category_kernel(
+    categories: pa.Array, weights: Optional[np.ndarray],
+    batch_size: int, rng: np.random.Generator, start: int = 0
+) -> pa.Array:
+    indices = rng.choice(len(categories), batch_size, p=weights)
+    return pa.DictionaryArray.from_arrays(pa.array(indices, type=pa.int32()), categories)
+
+def _pattern_kernel(pattern: CompiledPattern, batch_size: int, rng: np.random.Generator, start: int = 0) -> pa.Array:
+    # One draw per variable position, gathered from the per-position alphabets into the template
+    buffer = np.empty((batch_size, pattern.width), dtype=np.uint8)
+    buffer[:] = pattern.template
+    if len(pattern.positions):
+        indices = rng.integers(0, pattern.sizes, (batch_size, len(pattern.sizes)))
+        buffer[:, pattern.positions] = pattern.alphabets[np.arange(len(pattern.sizes)), indices]
+    return _fixed_width_strings(buffer)
+
+def _pool_kernel(
+    sampler: Callable[[pools.ValuePools, int, np.random.Generator], pa.Array], locale: str, seed: int,
+    batch_size: int, rng: np.random.Generator, start: int = 0
+) -> pa.Array:
+    # Pools are cached per process, so workers build them once
+    return sampler(pools.get_pools(locale, seed), batch_size, rng)
+
+def _datetime_range(field: DataField, unit: str) -> Tuple[np.datetime64, int]:
+    """Resolve the start and number of distinct values of a date/datetime field"""
+    start = np.datetime64(field.options.get("start", DEFAULT_DATE_RANGE[0]), unit)
+    end = np.datetime64(field.options.get("end", DEFAULT_DATE_RANGE[1]), unit)
+    if end < start:
+        raise ValueError(f"Field '{field.name}': end {end} is before start {start}")
+    return start, int((end - start).astype(np.int64)) + 1
+
+def _category_values(field: DataField) -> pa.Array:
+    categories = field.options.get("categories") or DEFAULT_CATEGORIES
+    return pa.array([str(c) for c in categories], type=pa.string())
+
+def _category_weights(field: DataField, categories: pa.Array) -> Optional[np.ndarray]:
+    weights = field.options.get("weights")
+    if weights is None:
+        return None
+    if len(weights) != len(categories):
+        raise ValueError(f"Field '{field.name}': weights must match categories")
+    weights = np.asarray(weights, dtype=np.float64)
+    return weights / weights.sum()
+
+def _field_pattern(field: DataField) -> CompiledPattern:
+    if "regex" in field.options:
+        return compile_pattern(regex=field.options["regex"])
+    return compile_pattern(field.options.get("pattern", DEFAULT_PATTERN))
+
+def _locale(field: DataField) -> str:
+    return field.options.get("locale", pools.DEFAULT_LOCALE)
+
+def _compile_uuid(field: DataField, seed: int) -> Kernel:
+    return partial(_uuid_kernel, field.options.get("storage", UUID_STORAGE_STRING) == UUID_STORAGE_BINARY)
+
+def _compile_name(field: DataField, seed: int) -> Kernel:
+    return partial(_pool_kernel, pools.sample_names, _locale(field), seed)
+
+def _compile_email(field: DataField, seed: int) -> Kernel:
+    return partial(_pool_kernel, pools.sample_emails, _locale(field), seed)
+
+def _quantiles(field: DataField) -> Optional[np.ndarray]:
+    quantiles = field.options.get("quantiles")
+    if quantiles is None:
+        return None
+    quantiles = np.asarray(quantiles, dtype=np.float64)
+    if len(quantiles) < 2 or np.any(np.diff(quantiles) < 0):
+        raise ValueError(f"Field '{field.name}': quantiles must be at least two ascending values")
+    return quantiles
+
+def _compile_integer(field: DataField, seed: int) -> Kernel:
+    quantiles = _quantiles(field)
+    if quantiles is not None:
+        return partial(_quantile_kernel, quantiles, None)
+    return partial(_integer_kernel, field.options.get("min", DEFAULT_MIN), field.options.get("max", DEFAULT_MAX))
+
+def _compile_float(field: DataField, seed: int) -> Kernel:
+    quantiles = _quantiles(field)
+    if quantiles is not None:
+        return partial(_quantile_kernel, quantiles, field.options.get("decimals", DEFAULT_DECIMALS))
+    return partial(
+        _float_kernel,
+        field.options.get("min", DEFAULT_MIN),
+        field.options.get("max", DEFAULT_MAX),
+        field.options.get("decimals", DEFAULT_DECIMALS)
+    )
+
+def _compile_string(field: DataField, seed: int) -> Kernel:
+    return partial(_string_kernel, field.options.get("length", DEFAULT_STRING_LENGTH))
+
+def _compile_boolean(field: DataField, seed: int) -> Kernel:
+    return partial(_boolean_kernel, field.options.get("probability", 0.5))
+
+def _compile_date(field: DataField, seed: int) -> Kernel:
+    return partial(_datetime_kernel, *_datetime_range(field, "D"), "D", pa.date32())
+
+def _compile_datetime(field: DataField, seed: int) -> Kernel:
+    return partial(_datetime_kernel, *_datetime_range(field, "s"), "s", pa.timestamp("s"))
+
+def _compile_category(field: DataField, seed: int) -> Kernel:
+    categories = _category_values(field)
+    return partial(_category_kernel, categories, _category_weights(field, categories))
+
+def _compile_pattern(field: DataField, seed: int) -> Kernel:
+    return partial(_pattern_kernel, _field_pattern(field))
+
+_FIELD_COMPILERS: Dict[FieldType, Callable[[DataField, int], Kernel]] = {
+    FieldType.UUID: _compile_uuid,
+    FieldType.NAME: _compile_name,
+    FieldType.EMAIL: _compile_email,
+    FieldType.INTEGER: _compile_integer,
+    FieldType.FLOAT: _compile_float,
+    FieldType.STRING: _compile_string,
+    FieldType.BOOLEAN: _compile_boolean,
+    FieldType.DATE: _compile_date,
+    FieldType.DATETIME: _compile_datetime,
+    FieldType.CATEGORY: _compile_category,
+    FieldType.PATTERN: _compile_pattern,
+}
+
+# Unique fields map a keyed permutation of the global row index onto the field's
+# value space, so uniqueness holds across batches and workers without a seen-set
+UNIQUE_BLOCK_SIZE = 10000
+UNIQUE_STRING_DIGITS = 12  # 36**12 indexed positions fit in 64 bits
+UNIQUE_PATTERN_SPACE = 2 ** 63
+
+def _pattern_digits(pattern: CompiledPattern) -> Tuple[int, int]:
+    """Trailing variable positions that spell a unique index, and their value space"""
+    digits, space = 0, 1
+    for size in pattern.sizes[::-1]:
+        if space * int(size) > UNIQUE_PATTERN_SPACE:
+            break
+        space *= int(size)
+        digits += 1
+    return digits, space
+
+def _float_grid(field: DataField) -> Tuple[int, int, int]:
+    """Resolve the rounded float values of a field as integer steps: (low, count, scale)"""
+    scale = 10 ** field.options.get("decimals", DEFAULT_DECIMALS)
+    low = int(np.ceil(field.options.get("min", DEFAULT_MIN) * scale))
+    high = int(np.ceil(field.options.get("max", DEFAULT_MAX) * scale))
+    return low, max(0, high - low), scale
+
+def unique_value_space(field: DataField, seed: int = 0) -> Optional[int]:
+    """Number of distinct values a unique field can take; None when unbounded"""
+    if field.type == FieldType.UUID:
+        return 2 ** 62
+    if field.type == FieldType.NAME:
+        value_pools = pools.get_pools(_locale(field), seed)
+        return len(value_pools.first_names) * len(value_pools.last_names)
+    if field.type == FieldType.EMAIL:
+        return None
+    if field.type == FieldType.INTEGER:
+        return max(0, field.options.get("max", DEFAULT_MAX) - field.options.get("min", DEFAULT_MIN))
+    if field.type == FieldType.FLOAT:
+        return _float_grid(field)[1]
+    if field.type == FieldType.STRING:
+        length = field.options.get("length", DEFAULT_STRING_LENGTH)
+        return len(_ALPHANUMERIC) ** min(length, UNIQUE_STRING_DIGITS)
+    if field.type == FieldType.BOOLEAN:
+        return 2
+    if field.type == FieldType.DATE:
+        return _datetime_range(field, "D")[1]
+    if field.type == FieldType.DATETIME:
+        return _datetime_range(field, "s")[1]
+    if field.type == FieldType.CATEGORY:
+        return len(_category_values(field))
+    if field.type == FieldType.PATTERN:
+        return _pattern_digits(_field_pattern(field))[1]
+    raise ValueError(f"Unsupported field type: {field.type}")
+
+def check_unique_capacity(model: DataModel, rows: int, seed: int = 0):
+    """Raise before generating when a unique field cannot cover the requested rows"""
+    for field in model.fields:
+        if not field.unique:
+            continue
+        space = unique_value_space(field, seed)
+        if space is not None and rows > space:
+            raise ValueError(
+                f"Field '{field.name}' is unique but has only {space:,} distinct values "
+                f"for {rows:,} rows"
+            )
+
+def _unique_uuid(binary: bool, indices: np.ndarray, rng: np.random.Generator) -> pa.Array:
+    # The low 62 bits carry the permuted row index; the rest stays random
+    raw = uuid4_bytes(rng, len(indices))
+    raw[:, 8:16] = indices.astype(">u8").view(np.uint8).reshape(len(indices), 8)
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    if binary:
+        return pa.FixedSizeBinaryArray.from_buffers(
+            pa.binary(16), len(indices), [None, pa.py_buffer(raw)]
+        )
+    return _fixed_width_strings(_uuid_string_buffer(raw))
+
+def _unique_name(locale: str, seed: int, indices: np.ndarray, rng: np.random.Generator) -> pa.Array:
+    value_pools = pools.get_pools(locale, seed)
+    last_count = np.uint64(len(value_pools.last_names))
+    first = value_pools.first_names.values.take((indices // last_count).astype(np.int64))
+    last = value_pools.last_names.values.take((indices % last_count).astype(np.int64))
+    return pc.binary_join_element_wise(first, last, " ")
+
+def _unique_email(locale: str, seed: int, indices: np.ndarray, rng: np.random.Generator) -> pa.Array:
+    return pools.sample_emails(pools.get_pools(locale, seed), len(indices), rng, suffixes=indices)
+
+def _unique_integer(low: int, indices: np.ndarray, rng: np.random.Generator) -> pa.Array:
+    return pa.array(low + indices.astype(np.int64))
+
+def _unique_float(low: int, scale: int, indices: np.ndarray, rng: np.random.Generator) -> pa.Array:
+    return pa.array((low + indices.astype(np.int64)) / scale)
+
+def _unique_string(length: int, indices: np.ndarray, rng: np.random.Generator) -> pa.Array:
+    # Trailing characters spell the index in base 36; any longer prefix stays random
+    digits = min(length, UNIQUE_STRING_DIGITS)
+    buffer = np.empty((len(indices), length), dtype=np.uint8)
+    buffer[:, :length - digits] = _ALPHANUMERIC[rng.integers(0, len(_ALPHANUMERIC), (len(indices), length - digits))]
+    remaining = indices.copy()
+    base = np.uint64(len(_ALPHANUMERIC))
+    for position in range(length - 1, length - digits - 1, -1):
+        buffer[:, position] = _ALPHANUMERIC[remaining % base]
+        remaining //= base
+    return _fixed_width_strings(buffer)
+
+def _unique_boolean(indices: np.ndarray, rng: np.random.Generator) -> pa.Array:
+    return pa.array(indices.astype(bool))
+
+def _unique_datetime(first: np.datetime64, unit: str, arrow_type: pa.DataType, indices: np.ndarray, rng: np.random.Generator) -> pa.Array:
+    return pa.array(first + indices.astype(f"timedelta64[{unit}]"), type=arrow_type)
+
+def _unique_category(categories: pa.Array, indices: np.ndarray, rng: np.random.Generator) -> pa.Array:
+    return pa.DictionaryArray.from_arrays(pa.array(indices.astype(np.int32)), categories)
+
+def _unique_pattern(pattern: CompiledPattern, digits: int, indices: np.ndarray, rng: np.random.Generator) -> pa.Array:
+    # Trailing positions spell the index in mixed radix; any leading ones stay random
+    buffer = np.empty((len(indices), pattern.width), dtype=np.uint8)
+    buffer[:] = pattern.template
+    leading = len(pattern.sizes) - digits
+    if leading:
+        random_indices = rng.integers(0, pattern.sizes[:leading], (len(indices), leading))
+        buffer[:, pattern.positions[:leading]] = pattern.alphabets[np.arange(leading), random_indices]
+    remaining = indices.copy()
+    for row in range(len(pattern.sizes) - 1, leading - 1, -1):
+        size = np.uint64(pattern.sizes[row])
+        buffer[:, pattern.positions[row]] = pattern.alphabets[row, remaining % size]
+        remaining //= size
+    return _fixed_width_strings(buffer)
+
+def _unique_mapper(field: DataField, seed: int) -> Callable[[np.ndarray, np.random.Generator], pa.Array]:
+    """Resolve how permuted indices become values for a unique field"""
+    if field.type == FieldType.UUID:
+        return partial(_unique_uuid, field.options.get("storage", UUID_STORAGE_STRING) == UUID_STORAGE_BINARY)
+    if field.type == FieldType.NAME:
+        return partial(_unique_name, _locale(field), seed)
+    if field.type == FieldType.EMAIL:
+        return partial(_unique_email, _locale(field), seed)
+    if field.type == FieldType.INTEGER:
+        return partial(_unique_integer, field.options.get("min", DEFAULT_MIN))
+    if field.type == FieldType.FLOAT:
+        low, _, scale = _float_grid(field)
+        return partial(_unique_float, low, scale)
+    if field.type == FieldType.STRING:
+        return partial(_unique_string, field.options.get("length", DEFAULT_STRING_LENGTH))
+    if field.type == FieldType.BOOLEAN:
+        return _unique_boolean
+    if field.type == FieldType.DATE:
+        return partial(_unique_datetime, _datetime_range(field, "D")[0], "D", pa.date32())
+    if field.type == FieldType.DATETIME:
+        return partial(_unique_datetime, _datetime_range(field, "s")[0], "s", pa.timestamp("s"))
+    if field.type == FieldType.CATEGORY:
+        return partial(_unique_category, _category_values(field))
+    if field.type == FieldType.PATTERN:
+        pattern = _field_pattern(field)
+        return partial(_unique_pattern, pattern, _pattern_digits(pattern)[0])
+    raise ValueError(f"Unsupported field type: {field.type}")
+
+def _unique_kernel(
+    name: str, space: Optional[int], permutation: FeistelPermutation,
+    mapper: Callable[[np.ndarray, np.random.Generator], pa.Array],
+    batch_size: int, rng: np.random.Generator, start: int = 0
+) -> pa.Array:
+    rows = np.arange(start, start + batch_size, dtype=np.uint64)
+    if space is None:
+        # Unbounded spaces shuffle within fixed blocks so values stay close to the row count
+        indices = blocked_permutation(rows, permutation)
+    elif start + batch_size > space:
+        raise ValueError(f"Field '{name}' is unique but has only {space:,} distinct values")
+    else:
+        indices = permutation(rows)
+    return mapper(indices, rng)
+
+def _compile_unique(field: DataField, seed: int) -> Kernel:
+    space = unique_value_space(field, seed)
+    permutation = FeistelPermutation(UNIQUE_BLOCK_SIZE if space is None else space, permutation_key(seed, field.name))
+    return partial(_unique_kernel, field.name, space, permutation, _unique_mapper(field, seed))
+
+_FIELD_TYPES: Dict[FieldType, pa.DataType] = {
+    FieldType.UUID: pa.string(),
+    FieldType.NAME: pa.dictionary(pa.int32(), pa.string()),
+    FieldType.EMAIL: pa.string(),
+    FieldType.INTEGER: pa.int64(),
+    FieldType.FLOAT: pa.float64(),
+    FieldType.STRING: pa.string(),
+    FieldType.BOOLEAN: pa.bool_(),
+    FieldType.DATE: pa.date32(),
+    FieldType.DATETIME: pa.timestamp("s"),
+    FieldType.CATEGORY: pa.dictionary(pa.int32(), pa.string()),
+    FieldType.PATTERN: pa.string(),
+}
+
+def _mask_nulls(values: pa.Array, null_rate: float, rng: np.random.Generator) -> pa.Array:
+    mask = pa.array(rng.random(len(values)) < null_rate)
+    if pa.types.is_dictionary(values.type):
+        indices = pc.if_else(mask, pa.scalar(None, type=values.indices.type), values.indices)
+        return pa.DictionaryArray.from_arrays(indices, values.dictionary)
+    return pc.if_else(mask, pa.scalar(None, type=values.type), values)
+
+def _null_rate(field: DataField) -> Optional[float]:
+    return None if field.required else field.options.get("null_rate", DEFAULT_NULL_RATE)
+
+def _apply_null_mask(field: DataField, values: pa.Array, rng: np.random.Generator) -> pa.Array:
+    """Null out a random share of values for optional fields"""
+    null_rate = _null_rate(field)
+    return values if null_rate is None else _mask_nulls(values, null_rate, rng)
+
+def generate_field_data(
+    field: DataField,
+    batch_size: int,
+    rng: Optional[np.random.Generator] = None,
+    seed: Optional[int] = None,
+    start: int = 0
+) -> pa.Array:
+    """Generate a whole batch of values for a single field as an Arrow array"""
+    if rng is None:
+        rng = np.random.default_rng()
+    values = _compile_field(field, seed or 0)(batch_size, rng, start)
+    return _apply_null_mask(field, values, rng)
+
+def _arrow_type(field: DataField) -> pa.DataType:
+    if field.type == FieldType.UUID and field.options.get("storage") == UUID_STORAGE_BINARY:
+        return pa.binary(16)
+    if field.type == FieldType.NAME and field.unique:
+        # Unique names have no repeats for a dictionary to share
+        return pa.string()
+    return _FIELD_TYPES[field.type]
+
+def field_schema(model: DataModel) -> pa.Schema:
+    return pa.schema([(field.name, _arrow_type(field)) for field in model.fields])
+
+# Values are keyed on (seed, field, row block) through counter-based Philox streams,
+# so any row range of a job is reproducible on its own, whatever the batch size
+ROW_BLOCK_SIZE = 10000
+_ROW_STREAM = 0x726F7773  # keeps row streams apart from permutation keys
+
+def stream_key(entropy: int, name: str) -> np.ndarray:
+    """Philox key for one named stream (a field, a foreign key) of a job"""
+    sequence = np.random.SeedSequence(entropy, spawn_key=(_ROW_STREAM, zlib.crc32(name.encode())))
+    return sequence.generate_state(2, dtype=np.uint64)
+
+def block_rng(key: np.ndarray, block: int) -> np.random.Generator:
+    """Generator for one row block; each block owns 2**128 counter values"""
+    return np.random.Generator(np.random.Philox(key=key, counter=np.array([0, 0, block, 0], dtype=np.uint64)))
+
+def row_blocks(start: int, stop: int, rows: int) -> Iterator[Tuple[int, int, int]]:
+    """(block, first row, row count) of every block of an N-row job that overlaps [start, stop)"""
+    for block in range(start // ROW_BLOCK_SIZE, (stop - 1) // ROW_BLOCK_SIZE + 1):
+        block_start = block * ROW_BLOCK_SIZE
+        yield block, block_start, min(ROW_BLOCK_SIZE, rows - block_start)
+
+def _concat(arrays: List[pa.Array]) -> pa.Array:
+    return arrays[0] if len(arrays) == 1 else pa.concat_arrays(arrays)
+
+class ColumnPlan(NamedTuple):
+    """One compiled column: resolved kernel, null rate and Philox stream key"""
+    name: str
+    kernel: Kernel
+    null_rate: Optional[float]
+    key: np.ndarray
+
+    def generate(self, batch_size: int, rng: np.random.Generator, start: int = 0) -> pa.Array:
+        values = self.kernel(batch_size, rng, start)
+        return values if self.null_rate is None else _mask_nulls(values, self.null_rate, rng)
+
+class GenerationPlan(NamedTuple):
+    """Immutable, picklable plan of column kernels for one model and seed"""
+    columns: Tuple[ColumnPlan, ...]
+    schema: pa.Schema
+
+def _compile_field(field: DataField, seed: int) -> Kernel:
+    if field.unique:
+        return _compile_unique(field, seed)
+    compiler = _FIELD_COMPILERS.get(field.type)
+    if compiler is None:
+        raise ValueError(f"Unsupported field type: {field.type}")
+    return compiler(field, seed)
+
+PLAN_CACHE_SIZE = 64
+_plans: "OrderedDict[Tuple[str, int], GenerationPlan]" = OrderedDict()
+_plans_lock = threading.Lock()
+
+def compile_plan(model: DataModel, seed: int) -> GenerationPlan:
+    """Validate and resolve every field once; cached by a hash of the model and the seed"""
+    cache_key = (fingerprint(model), seed)
+    with _plans_lock:
+        plan = _plans.get(cache_key)
+        if plan is not None:
+            _plans.move_to_end(cache_key)
+            return plan
+    plan = GenerationPlan(
+        columns=tuple(
+            ColumnPlan(field.name, _compile_field(field, seed), _null_rate(field), stream_key(seed, field.name))
+            for field in model.fields
+        ),
+        schema=field_schema(model)
+    )
+    with _plans_lock:
+        _plans[cache_key] = plan
+        while len(_plans) > PLAN_CACHE_SIZE:
+            _plans.popitem(last=False)
+    return plan
+
+def _generate_range(plan: GenerationPlan, task: Tuple[int, int, int]) -> Tuple[pa.RecordBatch, Dict[str, Any]]:
+    """Generate rows [start, stop) of a job with the given total rows; runs inside pool workers"""
+    start, stop, rows = task
+    range_start = time.perf_counter()
+    blocks = list(row_blocks(start, stop, rows))
+    offset = start - blocks[0][1]
+    arrays = []
+    field_seconds = {}
+    for column in plan.columns:
+        field_start = time.perf_counter()
+        values = _concat([
+            column.generate(block_rows, block_rng(column.key, block), block_start)
+            for block, block_start, block_rows in blocks
+        ])
+        arrays.append(values.slice(offset, stop - start))
+        field_seconds[column.name] = time.perf_counter() - field_start
+    batch = pa.RecordBatch.from_arrays(arrays, schema=plan.schema)
+    timings = {
+        "fields": field_seconds,
+        "seconds": time.perf_counter() - range_start,
+        "finished_at": time.time(),
+        "rss": current_rss(),
+    }
+    return batch, timings
+
+def generate_rows(model: DataModel, seed: int, start: int, stop: int, rows: int) -> pa.RecordBatch:
+    """Rows [start, stop) of an N-row job, byte-identical to the same rows of a full run"""
+    if not 0 <= start < stop <= rows:
+        raise ValueError(f"Row range [{start}, {stop}) is outside a {rows:,}-row job")
+    return _generate_range(compile_plan(model, seed), (start, stop, rows))[0]
+
+def _range_tasks(start: int, stop: int, rows: int, task_rows: int) -> Iterator[Tuple[int, int, int]]:
+    """Split [start, stop) at multiples of task_rows so interior tasks cover whole blocks"""
+    task_start = start
+    while task_start < stop:
+        task_stop = min(stop, (task_start // task_rows + 1) * task_rows)
+        yield task_start, task_stop, rows
+        task_start = task_stop
+
+def _rechunk(batches: Iterator[pa.RecordBatch], batch_size: int) -> Iterator[pa.RecordBatch]:
+    """Re-slice a stream of record batches into batches of exactly batch_size rows"""
+    pending: List[pa.RecordBatch] = []
+    pending_rows = 0
+    for batch in batches:
+        offset = 0
+        while offset < batch.num_rows:
+            length = min(batch_size - pending_rows, batch.num_rows - offset)
+            pending.append(batch.slice(offset, length))
+            pending_rows += length
+            offset += length
+            if pending_rows == batch_size:
+                yield pending[0] if len(pending) == 1 else pa.Table.from_batches(pending).combine_chunks().to_batches()[0]
+                pending = []
+                pending_rows = 0
+    if pending:
+        yield pending[0] if len(pending) == 1 else pa.Table.from_batches(pending).combine_chunks().to_batches()[0]
+
+def _task_rows(batch_size: int) -> int:
+    # Workers get whole blocks so no block is generated twice
+    return -(-batch_size // ROW_BLOCK_SIZE) * ROW_BLOCK_SIZE
+
+def effective_workers(rows: int, batch_size: int, max_workers: int, row_range: Optional[Tuple[int, int]] = None) -> int:
+    """Worker processes a job really uses: a job of a single task runs in this process,
+    and no job uses more workers than the shared pool has"""
+    start, stop = row_range if row_range is not None else (0, rows)
+    task_rows = _task_rows(batch_size)
+    tasks = (stop - 1) // task_rows - start // task_rows + 1 if stop > start else 0
+    return max(1, min(max_workers, scheduler.POOL_WORKERS)) if tasks > 1 else 1
+
+def generate_data_iter(
     model: DataModel,
     rows: int,
     batch_size: int = 10000,
     seed: int = None,
     progress_callback: Optional[Callable[[float], None]] = None,
-    max_workers: int = 4
-) -> pd.DataFrame:
-    """Generate data based on the specified model with progress reporting"""
+    max_workers: int = 4,
+    report: Optional[PerformanceReport] = None,
+    row_range: Optional[Tuple[int, int]] = None
+) -> Iterator[pa.RecordBatch]:
+    """Stream generated data as fixed-size Arrow record batches with bounded memory"""
+    # Values depend only on (seed, field, row), so the output is identical for any
+    # worker count or batch size, and row_range yields a slice of the full job
+    entropy = seed if seed is not None else np.random.SeedSequence().entropy
+    check_unique_capacity(model, rows, entropy)
+    start, stop = row_range if row_range is not None else (0, rows)
+    if not 0 <= start <= stop <= rows:
+        raise ValueError(f"Row range [{start}, {stop}) is outside a {rows:,}-row job")
+    total_batches = (stop - start + batch_size - 1) // batch_size
+    tasks = list(_range_tasks(start, stop, rows, _task_rows(batch_size)))
+    workers = effective_workers(rows, batch_size, max_workers, (start, stop))
+    # Workers receive the compiled plan, not the model, and never re-resolve options
+    plan = compile_plan(model, entropy)
+    if report is not None:
+        report.begin(model, stop - start)
+    results = scheduler.run_ordered(partial(_generate_range, plan), tasks, workers)
+
+    def ranges() -> Iterator[pa.RecordBatch]:
+        wait_start = time.perf_counter()
+        for task_num, (batch, timings) in enumerate(results):
+            if report is not None:
+                report.record_batch(task_num, batch.num_rows, timings, time.perf_counter() - wait_start, workers > 1)
+            yield batch
+            wait_start = time.perf_counter()
+
+    for batch_num, batch in enumerate(_rechunk(ranges(), batch_size)):
+        yield batch
+        if progress_callback:
+            progress = (batch_num + 1) / total_batches
+            progress_callback(progress)
+    if report is not None:
+        report.finish()
+
+def as_pandas(table: pa.Table) -> "pd.DataFrame":
+    """Zero-copy pandas view of an Arrow table backed by Arrow memory"""
+    import pandas as pd
+
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+def generate_table(
+    model: DataModel,
+    rows: int,
+    batch_size: int = 10000,
+    seed: int = None,
+    progress_callback: Optional[Callable[[float], None]] = None,
+    max_workers: int = 4,
+    report: Optional[PerformanceReport] = None
+) -> pa.Table:
+    """Generate data as an Arrow table with dictionary-encoded low-cardinality columns"""
     try:
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
-            Faker.seed(seed)
-        
-        data = {}
-        total_batches = (rows + batch_size - 1) // batch_size
-        
-        for batch_num in range(total_batches):
-            current_batch_size = min(batch_size, rows - batch_num * batch_size)
-            
-            # Use threading for parallel field generation
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                results = {
-                    field.name: executor.submit(generate_field_data, field, current_batch_size)
-                    for field in model.fields
-                }
-                
-                for field_name, future in results.items():
-                    if field_name not in data:
-                        data[field_name] = []
-                    data[field_name].extend(future.result())
-            
-            if progress_callback:
-                progress = (batch_num + 1) / total_batches
-                progress_callback(progress)
-        
-        return pd.DataFrame(data)
-    
+        batches = generate_data_iter(model, rows, batch_size, seed, progress_callback, max_workers, report)
+        return pa.Table.from_batches(batches, schema=field_schema(model))
+
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise RuntimeError(f"Data generation failed: {str(e)}") from e
+
+def generate_data(
+    model: DataModel,
+    rows: int,
+    batch_size: int = 10000,
+    seed: int = None,
+    progress_callback: Optional[Callable[[float], None]] = None,
+    max_workers: int = 4,
+    report: Optional[PerformanceReport] = None
+) -> "pd.DataFrame":
+    """Generate data based on the specified model with progress reporting"""
+    return as_pandas(generate_table(model, rows, batch_size, seed, progress_callback, max_workers, report))
+
+class LazyDataset:
+    """Handle to a generation run that only materializes the rows asked for"""
+
+    def __init__(self, model: DataModel, rows: int, batch_size: int = 10000, seed: int = None, max_workers: int = 4):
+        # Fix the seed now so previews and the full run draw the same rows
+        self.seed = seed if seed is not None else np.random.SeedSequence().entropy
+        check_unique_capacity(model, rows, self.seed)
+        self.model = model
+        self.num_rows = rows
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self._head: Optional[pa.Table] = None
+
+    @property
+    def schema(self) -> pa.Schema:
+        return field_schema(self.model)
+
+    @property
+    def column_names(self) -> List[str]:
+        return self.model.field_names
+
+    def slice(self, start: int, stop: int) -> pa.Table:
+        """Rows [start, stop), generated on their own"""
+        stop = min(stop, self.num_rows)
+        if start >= stop:
+            return self.schema.empty_table()
+        return pa.Table.from_batches([generate_rows(self.model, self.seed, start, stop, self.num_rows)])
+
+    def head(self, k: int = 50) -> pa.Table:
+        """First k rows; the covering row block is generated once and reused"""
+        if self._head is None or self._head.num_rows < min(k, self.num_rows):
+            self._head = self.slice(0, max(k, min(ROW_BLOCK_SIZE, self.num_rows)))
+        return self._head.slice(0, k)
+
+    def iter_batches(
+        self,
+        progress_callback: Optional[Callable[[float], None]] = None,
+        report: Optional[PerformanceReport] = None
+    ) -> Iterator[pa.RecordBatch]:
+        """Stream every row, e.g. straight into an exporter"""
+        return generate_data_iter(
+            self.model, self.num_rows, self.batch_size, self.seed, progress_callback, self.max_workers, report
+        )
+
+    def __iter__(self) -> Iterator[pa.RecordBatch]:
+        return self.iter_batches()
+
+    def to_table(
+        self,
+        progress_callback: Optional[Callable[[float], None]] = None,
+        report: Optional[PerformanceReport] = None
+    ) -> pa.Table:
+        """Materialize all rows"""
+        return pa.Table.from_batches(self.iter_batches(progress_callback, report), schema=self.schema)
+
+def generate_lazy(
+    model: DataModel,
+    rows: int,
+    batch_size: int = 10000,
+    seed: int = None,
+    max_workers: int = 4
+) -> LazyDataset:
+    """Return a lazy handle instead of generating all rows up front"""
+    return LazyDataset(model, rows, batch_size, seed, max_workers)
@@ -0,0 +1,133 @@
+import os
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from data_models import DataModel
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, or None without psutil"""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process(os.getpid()).memory_info().rss
+
+class PerformanceReport:
+    """Timings, throughput and memory collected while generating and exporting one dataset"""
+
+    def __init__(self):
+        self.model_name: Optional[str] = None
+        self.rows = 0
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.field_types: Dict[str, str] = {}
+        self.field_seconds: Dict[str, float] = {}
+        self.batches: List[Dict[str, Any]] = []
+        self.wait_seconds = 0.0
+        self.transfer_seconds = 0.0
+        self.peak_rss = current_rss()
+        self.peak_worker_rss: Optional[int] = None
+        self.exports: List[Dict[str, Any]] = []
+
+    def begin(self, model: DataModel, rows: int):
+        """Start a generation run, discarding everything recorded for an earlier one"""
+        self.__init__()
+        self.model_name = model.name
+        self.rows = rows
+        self.field_types = {field.name: field.type.value for field in model.fields}
+        self.field_seconds = {field.name: 0.0 for field in model.fields}
+
+    def sample_memory(self):
+        rss = current_rss()
+        if rss is not None and (self.peak_rss is None or rss > self.peak_rss):
+            self.peak_rss = rss
+
+    def record_batch(self, batch_num: int, rows: int, timings: Dict[str, Any], wait: float, remote: bool):
+        """Add one batch: worker-side field timings plus how long the consumer waited for it"""
+        for name, seconds in timings["fields"].items():
+            self.field_seconds[name] = self.field_seconds.get(name, 0.0) + seconds
+        # Time between the worker finishing and the batch arriving: pickling, the pipe and ordering
+        transfer = max(0.0, time.time() - timings["finished_at"]) if remote else 0.0
+        self.wait_seconds += wait
+        self.transfer_seconds += transfer
+        if remote and timings.get("rss") is not None:
+            self.peak_worker_rss = max(self.peak_worker_rss or 0, timings["rss"])
+        self.batches.append({
+            "batch": batch_num,
+            "rows": rows,
+            "seconds": timings["seconds"],
+            "wait_seconds": wait,
+            "transfer_seconds": transfer,
+        })
+        self.sample_memory()
+
+    def finish(self):
+        self.finished = time.perf_counter()
+        self.sample_memory()
+
+    def record_export(self, format_type: str, rows: int, seconds: float, source_seconds: float, output_bytes: Optional[int]):
+        """Add one export; serialization is the time not spent waiting on the source batches"""
+        self.exports.append({
+            "format": format_type,
+            "rows": rows,
+            "seconds": seconds,
+            "source_seconds": source_seconds,
+            "serialize_seconds": max(0.0, seconds - source_seconds),
+            "rows_per_sec": rows / seconds if seconds else None,
+            "output_bytes": output_bytes,
+        })
+        self.sample_memory()
+
+    @property
+    def generation_seconds(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def field_report(self) -> List[Dict[str, Any]]:
+        total = sum(self.field_seconds.values()) or 1.0
+        return [
+            {
+                "field": name,
+                "type": self.field_types.get(name),
+                "seconds": seconds,
+                "rows_per_sec": self.rows / seconds if seconds else None,
+                "share": seconds / total,
+            }
+            for name, seconds in sorted(self.field_seconds.items(), key=lambda item: -item[1])
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        seconds = self.generation_seconds
+        return {
+            "model": self.model_name,
+            "rows": self.rows,
+            "generation_seconds": seconds,
+            "rows_per_sec": self.rows / seconds if seconds else None,
+            "batch_count": len(self.batches),
+            "wait_seconds": self.wait_seconds,
+            "transfer_seconds": self.transfer_seconds,
+            "peak_rss": self.peak_rss,
+            "peak_worker_rss": self.peak_worker_rss,
+            "fields": self.field_report(),
+            "batches": self.batches,
+            "exports": self.exports,
+        }
+
+class SourceTimer:
+    """Wrap an iterable and accumulate the time spent producing its items"""
+
+    def __init__(self, items: Iterable):
+        self._items = iter(items)
+        self.seconds = 0.0
+        self.rows = 0
+
+    def __iter__(self) -> Iterator:
+        while True:
+            start_time = time.perf_counter()
+            try:
+                item = next(self._items)
+            except StopIteration:
+                self.seconds += time.perf_counter() - start_time
+                return
+            self.seconds += time.perf_counter() - start_time
+            self.rows += item.num_rows
+            yield item
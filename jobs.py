@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+import traceback
+import uuid
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# Jobs beyond the cap wait in a queue; each running job may also use a process pool
+MAX_CONCURRENT_JOBS = int(os.environ.get("DATA_GENERATOR_MAX_JOBS", "2"))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation was requested"""
+
+class Job:
+    """A background unit of work with progress, result and cooperative cancellation"""
+
+    def __init__(self, kind: str, description: str = ""):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.description = description
+        self.status = QUEUED
+        self.progress = 0.0
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._cancel = threading.Event()
+
+    @property
+    def active(self) -> bool:
+        return self.status in (QUEUED, RUNNING)
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def set_progress(self, progress: float):
+        """Progress callback that doubles as a cancellation point"""
+        self.progress = progress
+        self.check_cancelled()
+
+    def iterate(self, items: Iterable, total_rows: Optional[int] = None) -> Iterator:
+        """Pass record batches through, checking for cancellation between them"""
+        rows = 0
+        for item in items:
+            self.check_cancelled()
+            yield item
+            if total_rows:
+                rows += item.num_rows
+                self.progress = min(1.0, rows / total_rows)
+        self.check_cancelled()
+
+class JobManager:
+    """Runs jobs on background threads with at most max_concurrent running at once"""
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_JOBS, max_finished: int = 100):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_finished = max_finished
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        kind: str,
+        func: Callable[..., Any],
+        *args: Any,
+        description: str = "",
+        thread_initializer: Optional[Callable[[threading.Thread], None]] = None,
+        **kwargs: Any
+    ) -> Job:
+        """Start func(job, *args, **kwargs) in the background and return its job"""
+        job = Job(kind, description)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        thread = threading.Thread(target=self._run, args=(job, func, args, kwargs), name=f"job-{job.id[:8]}", daemon=True)
+        if thread_initializer is not None:
+            thread_initializer(thread)
+        thread.start()
+        return job
+
+    def _run(self, job: Job, func: Callable[..., Any], args: tuple, kwargs: dict):
+        # Waiting for a slot is itself cancellable
+        while not self._slots.acquire(timeout=0.2):
+            if job.cancel_requested:
+                job.status = CANCELLED
+                job.finished = time.time()
+                return
+        try:
+            job.check_cancelled()
+            job.status = RUNNING
+            job.started = time.time()
+            job.result = func(job, *args, **kwargs)
+            job.progress = 1.0
+            job.status = DONE
+        except JobCancelled:
+            job.status = CANCELLED
+        except Exception as e:
+            traceback.print_exc()
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished = time.time()
+            self._slots.release()
+
+    def get(self, job_id: Optional[str]) -> Optional[Job]:
+        if job_id is None:
+            return None
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    @property
+    def running(self) -> int:
+        return sum(job.status == RUNNING for job in self.jobs())
+
+    def _prune(self):
+        # Forget the oldest finished jobs so results do not pile up in a long-lived server
+        finished = [job for job in self._jobs.values() if not job.active]
+        for job in sorted(finished, key=lambda job: job.created)[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job.id]
+
+_manager = JobManager()
+
+def get_job_manager() -> JobManager:
+    """Process-wide job manager shared by all sessions"""
+    return _manager
@@ -1,15 +1,122 @@
 import streamlit as st
 from config import setup_language, get_translation
-from data_models import DataModel, get_available_models
-from generator import generate_data
-from exporter import export_data
+import data_models
+from data_models import DataModel, FieldType
+from generator import generate_data_iter, generate_lazy, LazyDataset, field_schema, DEFAULT_PATTERN
+from exporter import export_data, file_extension, EXPORT_CHUNK_ROWS, PARQUET_CODECS, DEFAULT_ROW_GROUP_ROWS
+import result_cache
+import dataset_store
+from dataset_store import DatasetHandle
 import utils
+from instrumentation import PerformanceReport
+from jobs import Job, get_job_manager, DONE, FAILED, CANCELLED
 import os
 import time
+from functools import partial
 from streamlit.runtime.scriptrunner import add_script_run_ctx
 from streamlit.runtime.scriptrunner import get_script_run_ctx
 import threading
 
+# عدد النماذج المعروضة في نتائج البحث
+MODEL_RESULTS_LIMIT = 200
+
+def generation_job(job: Job, model: DataModel, rows: int, batch_size: int, seed: int, max_workers: int, cache_key: str):
+    """Background generation; the progress callback is also the cancellation point between batches"""
+    report = PerformanceReport()
+    batches = generate_data_iter(model, rows, batch_size, seed, job.set_progress, max_workers, report)
+    # Batches stream to disk, and the session keeps only a handle to the memory-mapped file
+    data = dataset_store.get_store().write(cache_key, batches, field_schema(model))
+    return {"data": data, "key": cache_key, "report": report}
+
+def export_job(job: Job, data, format_type: str, target: str, report: PerformanceReport = None,
+               export_key: str = None, **options):
+    """Background export that can be cancelled between chunks; options go to export_data"""
+    if isinstance(data, LazyDataset):
+        # Rows are generated here for the first time and streamed into the format
+        source = data.iter_batches(report=report)
+    else:
+        source = data.iter_batches(EXPORT_CHUNK_ROWS)
+    batches = job.iterate(source, data.num_rows)
+    file_data, location = export_data(batches, format_type, target, report=report, **options)
+    if file_data is None:
+        # Database and cloud exports leave nothing to download, at most a location
+        return location
+    cache = result_cache.get_cache()
+    with file_data:
+        # Keep the bytes only when they fit the cache budget; otherwise serve a file on disk
+        if file_data.seek(0, os.SEEK_END) <= cache.max_bytes:
+            file_data.seek(0)
+            content = file_data.read()
+            cache.put(export_key, content)
+            return content
+        file_data.seek(0)
+        path = dataset_store.get_store().write_file(export_key, file_data)
+    # download_button reads the file only when the user clicks it
+    return partial(read_download, path)
+
+def read_download(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+def submit_job(job_key: str, kind: str, func, *args, **kwargs) -> Job:
+    """Start a background job for this session; its thread shares the script context"""
+    ctx = get_script_run_ctx()
+    job = get_job_manager().submit(
+        kind, func, *args,
+        thread_initializer=lambda thread: add_script_run_ctx(thread, ctx),
+        **kwargs
+    )
+    st.session_state[job_key] = job.id
+    return job
+
+def _job_progress(job: Job):
+    if not job.active:
+        st.rerun()
+    st.progress(job.progress)
+    if job.started is None:
+        st.text(get_translation(current_language, "Waiting for a free worker slot..."))
+    else:
+        st.text(f"Progress: {job.progress*100:.1f}% ({job.elapsed:.1f} s)")
+    if st.button(get_translation(current_language, "Cancel"), key=f"cancel_{job.id}", disabled=job.cancel_requested):
+        job.cancel()
+
+def job_status(job_key: str):
+    """Show progress for the session's job while it runs; return it once it has finished"""
+    job = get_job_manager().get(st.session_state.get(job_key))
+    if job is None:
+        return None
+    if job.active:
+        st.fragment(_job_progress, run_every=1.0)(job)
+        return None
+    if job.status == FAILED:
+        st.error(f"{get_translation(current_language, 'Job failed')}: {job.error}")
+    elif job.status == CANCELLED:
+        st.warning(get_translation(current_language, "Job cancelled"))
+    return job
+
+def collect_generation():
+    """Move a finished generation job's result into the session, whichever page is open"""
+    job = get_job_manager().get(st.session_state.get("generate_job"))
+    if job is not None and job.status == DONE and st.session_state.get("generated_job") != job.id:
+        st.session_state.generated_data = job.result["data"]
+        st.session_state.generated_key = job.result["key"]
+        st.session_state.generation_report = job.result["report"]
+        st.session_state.generated_job = job.id
+
+def show_report(report: PerformanceReport):
+    """Render throughput, memory and the slowest fields of a generation run"""
+    summary = report.to_dict()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Rows/sec", utils.format_number(int(summary["rows_per_sec"] or 0)))
+    col2.metric("Peak RSS", utils.format_bytes(summary["peak_rss"]))
+    col3.metric("Worker peak RSS", utils.format_bytes(summary["peak_worker_rss"]))
+    col4.metric("Queue wait", f"{summary['wait_seconds']:.2f} s")
+    st.dataframe(summary["fields"])
+    if summary["exports"]:
+        st.dataframe(summary["exports"])
+    with st.expander("Batches"):
+        st.dataframe(summary["batches"])
+
 # إعداد الصفحة
 st.set_page_config(
     page_title="Data Generator Pro",
@@ -21,6 +128,9 @@ st.set_page_config(
 # تحميل الترجمة
 current_language = setup_language()
 
+# استلام نتائج المهام الخلفية
+collect_generation()
+
 # شريط التنقل العلوي
 st.markdown(utils.load_css(), unsafe_allow_html=True)
 
@@ -63,10 +173,11 @@ elif selected_menu == "generate":
     
     start_time = time.time()
     with st.spinner(get_translation(current_language, "Loading models...")):
-        available_models = get_available_models(search_term)
+        # The catalog index answers in milliseconds and reloads changed model files itself
+        available_models = data_models.get_available_models(search_term, MODEL_RESULTS_LIMIT)
         load_time = time.time() - start_time
     
-    st.caption(f"Loaded {len(available_models)} models in {load_time:.2f} seconds")
+    st.caption(f"Loaded {len(available_models)} models in {load_time * 1000:.1f} ms")
     
     if available_models:
         selected_model = st.selectbox(
@@ -100,34 +211,78 @@ elif selected_menu == "generate":
                                 index=field.available_types.index(field.type),
                                 key=f"type_{field.name}"
                             )
-                            customized_fields.append(field.copy(update={"type": field_type}))
+                            updates = {} if field_type == field.type else {"type": field_type}
+                            if field_type == FieldType.PATTERN:
+                                pattern = st.text_input(
+                                    f"{get_translation(current_language, 'Pattern for')} {field.name}",
+                                    field.options.get("pattern", DEFAULT_PATTERN),
+                                    key=f"pattern_{field.name}",
+                                    help="# digit, ? letter, * letter or digit, \\ escapes"
+                                )
+                                if pattern != field.options.get("pattern"):
+                                    updates["options"] = {**field.options, "pattern": pattern}
+                            # Unchanged fields keep their identity, so the model hash and its plan stay cached
+                            customized_fields.append(field.copy(update=updates) if updates else field)
             
             # إعدادات التوليد
             with st.expander(get_translation(current_language, "Generation Settings")):
                 rows = st.number_input(get_translation(current_language, "Number of Rows"), 1, 10000000, 1000)
                 batch_size = st.number_input(get_translation(current_language, "Batch Size"), 1, 100000, 1000)
                 seed = st.number_input(get_translation(current_language, "Random Seed"), value=42)
+                lazy = st.checkbox(
+                    get_translation(current_language, "Preview only (generate rows on export)"),
+                    value=st.session_state.get("lazy_preview", True)
+                )
+                st.session_state.lazy_preview = lazy
             
             # توليد البيانات
             if st.button(get_translation(current_language, "Generate Data")):
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                
-                start_time = time.time()
-                with st.spinner(get_translation(current_language, "Generating data...")):
-                    data = generate_data(
-                        model=selected_model.copy(update={"fields": customized_fields}),
-                        rows=rows,
-                        batch_size=batch_size,
-                        seed=seed,
-                        progress_callback=lambda p: (progress_bar.progress(p), 
-                                                  status_text.text(f"Progress: {p*100:.1f}%")))
-                    
-                    gen_time = time.time() - start_time
+                model = selected_model.copy(update={"fields": customized_fields})
+                cache_key = result_cache.fingerprint(model, rows=rows, batch_size=batch_size, seed=seed)
+                data = dataset_store.get_store().get(cache_key)
+                if data is None and lazy:
+                    # Only the displayed rows are generated now; exports stream the rest
+                    data = generate_lazy(model, rows, batch_size, seed, st.session_state.get("max_workers", 4))
+                    st.session_state.generated_data = data
+                    st.session_state.generated_key = cache_key
+                    st.session_state.generation_report = None
+                    st.session_state.pop("generate_job", None)
+                elif data is None:
+                    submit_job(
+                        "generate_job", "generate", generation_job,
+                        model, rows, batch_size, seed, st.session_state.get("max_workers", 4), cache_key,
+                        description=f"{model.name}: {rows:,} rows"
+                    )
+                else:
+                    # Cached results need no job
                     st.session_state.generated_data = data
+                    st.session_state.generated_key = cache_key
+                    st.session_state.generation_report = None
+                    st.session_state.pop("generate_job", None)
                     st.success(get_translation(current_language, 
-                        f"Successfully generated {rows:,} rows in {gen_time:.2f} seconds!"))
-                    st.dataframe(data.head(50))
+                        f"Successfully generated {rows:,} rows in 0.00 seconds!"))
+                    st.dataframe(data.head(50).to_pandas())
+            
+            # معاينة البيانات المؤجلة
+            preview = st.session_state.get("generated_data")
+            if isinstance(preview, LazyDataset) and preview.model.name == selected_model.name:
+                st.success(get_translation(current_language, 
+                    f"Preview of {preview.num_rows:,} rows ready; the rest is generated on export"))
+                st.dataframe(preview.head(50).to_pandas())
+            
+            # متابعة مهمة التوليد
+            job = job_status("generate_job")
+            if job is not None and job.status == DONE:
+                data = job.result["data"]
+                st.success(get_translation(current_language, 
+                    f"Successfully generated {data.num_rows:,} rows in {job.elapsed:.2f} seconds!"))
+                st.dataframe(data.head(50).to_pandas())
+            
+            # تقرير الأداء
+            report = st.session_state.get("generation_report")
+            if report is not None and report.model_name == selected_model.name:
+                with st.expander(get_translation(current_language, "Performance Report"), expanded=True):
+                    show_report(report)
 
 
 
@@ -135,34 +290,61 @@ elif selected_menu == "generate":
 elif selected_menu == "export":
     st.title(get_translation(current_language, "Export Data"))
     
-    if "generated_data" not in st.session_state:
+    data = st.session_state.get("generated_data")
+    if data is None or isinstance(data, DatasetHandle) and not data.exists:
+        # Stored datasets expire after the TTL; the session only held a handle
         st.warning(get_translation(current_language, "No data to export. Please generate data first."))
     else:
-        data = st.session_state.generated_data
+        report = st.session_state.get("generation_report")
+        if report is None and isinstance(data, LazyDataset):
+            # Exporting a lazy preview is the generation run, so it gets its own report
+            report = st.session_state.generation_report = PerformanceReport()
         
         # خيارات التصدير
         export_format = st.selectbox(
             get_translation(current_language, "Export Format"),
-            ["CSV", "Excel", "JSON", "Parquet", "SQL", "Cloud Storage"]
+            ["CSV", "Excel", "JSON", "NDJSON", "Parquet", "SQL", "Cloud Storage"]
         )
         
-        if export_format in ["CSV", "Excel", "JSON", "Parquet"]:
+        if export_format in ["CSV", "Excel", "JSON", "NDJSON", "Parquet"]:
             file_name = st.text_input(get_translation(current_language, "File Name"), "generated_data")
+            compression = row_group_size = None
+            if export_format in ["CSV", "NDJSON"]:
+                compression = st.selectbox(get_translation(current_language, "Compression"), ["None", "gzip", "zstd"])
+                compression = None if compression == "None" else compression
+            elif export_format == "Parquet":
+                compression = st.selectbox(get_translation(current_language, "Compression"), PARQUET_CODECS)
+                row_group_size = st.number_input(
+                    get_translation(current_language, "Row Group Size"), 1000, 10000000, DEFAULT_ROW_GROUP_ROWS, step=1000
+                )
             if st.button(get_translation(current_language, "Export")):
-                with st.spinner(get_translation(current_language, "Preparing export...")):
-                    file_data, file_path = export_data(
-                        data, 
-                        export_format.lower(), 
-                        file_name
+                format_type = export_format.lower()
+                export_key = result_cache.derive_key(
+                    st.session_state.generated_key, format=format_type,
+                    compression=compression, row_group_size=row_group_size
+                )
+                st.session_state.export_file = f"{file_name}.{file_extension(format_type, compression)}"
+                file_data = result_cache.get_cache().get(export_key)
+                if file_data is None:
+                    # Exports too large for the cache were kept on disk by an earlier job
+                    path = dataset_store.get_store().get_file(export_key)
+                    if path is not None:
+                        file_data = partial(read_download, path)
+                if file_data is None:
+                    submit_job(
+                        "export_job", "export", export_job,
+                        data, format_type, file_name, report, export_key=export_key,
+                        compression=compression, row_group_size=row_group_size,
+                        description=st.session_state.export_file
                     )
-                    
+                else:
+                    st.session_state.pop("export_job", None)
                     st.success(get_translation(current_language, 
-                        f"Data prepared for export as {file_path}"))
-                    
+                        f"Data prepared for export as {st.session_state.export_file}"))
                     st.download_button(
                         label=get_translation(current_language, "Download File"),
                         data=file_data,
-                        file_name=file_path,
+                        file_name=st.session_state.export_file,
                         mime="application/octet-stream"
                     )
         
@@ -171,18 +353,41 @@ elif selected_menu == "export":
             connection_string = st.text_input(get_translation(current_language, "Connection String"))
             table_name = st.text_input(get_translation(current_language, "Table Name"), "generated_data")
             if st.button(get_translation(current_language, "Export to Database")):
-                with st.spinner(get_translation(current_language, "Exporting to database...")):
-                    export_data(data, "sql", table_name, db_type, connection_string)
-                    st.success(get_translation(current_language, "Data exported to database successfully!"))
+                st.session_state.export_message = "Data exported to database successfully!"
+                submit_job(
+                    "export_job", "export", export_job,
+                    data, "sql", table_name, report, db_type=db_type, connection_string=connection_string,
+                    description=table_name
+                )
         
         elif export_format == "Cloud Storage":
-            cloud_provider = st.selectbox(get_translation(current_language, "Cloud Provider"), ["AWS S3", "Google Cloud Storage", "Azure Blob"])
+            cloud_provider = st.selectbox(get_translation(current_language, "Cloud Provider"), ["AWS S3", "Google Cloud Storage", "Azure Blob", "Local"])
             bucket_name = st.text_input(get_translation(current_language, "Bucket Name"))
             file_path = st.text_input(get_translation(current_language, "File Path"), "generated_data.parquet")
             if st.button(get_translation(current_language, "Upload to Cloud")):
-                with st.spinner(get_translation(current_language, "Uploading to cloud storage...")):
-                    export_data(data, "cloud", file_path, cloud_provider, bucket_name)
-                    st.success(get_translation(current_language, "Data uploaded to cloud storage successfully!"))
+                st.session_state.export_message = "Data uploaded to cloud storage successfully!"
+                submit_job(
+                    "export_job", "export", export_job,
+                    data, "cloud", file_path, report, cloud_provider=cloud_provider, bucket_name=bucket_name,
+                    description=file_path
+                )
+        
+        # متابعة مهمة التصدير
+        job = job_status("export_job")
+        if job is not None and job.status == DONE:
+            if job.result is None or isinstance(job.result, str):
+                st.success(get_translation(current_language, st.session_state.export_message))
+                if job.result:
+                    st.code(job.result)
+            else:
+                st.success(get_translation(current_language, 
+                    f"Data prepared for export as {st.session_state.export_file}"))
+                st.download_button(
+                    label=get_translation(current_language, "Download File"),
+                    data=job.result,
+                    file_name=st.session_state.export_file,
+                    mime="application/octet-stream"
+                )
 
 # صفحة الاتصال بأدوات BI
 elif selected_menu == "connect":
@@ -225,12 +430,33 @@ elif selected_menu == "settings":
     if st.button(get_translation(current_language, "Save Settings")):
         st.session_state.language = "en" if new_language == "English" else "ar"
      
-        st.experimental_rerun()
+        st.rerun()
     
     # إعدادات الأداء
     st.subheader(get_translation(current_language, "Performance Settings"))
-    cache_size = st.slider(get_translation(current_language, "Cache Size (MB)"), 10, 1000, 100)
-    max_threads = st.slider(get_translation(current_language, "Max Threads"), 1, 16, 4)
+    # The cache is shared by every session, so the widgets show its current settings
+    # and only an actual change reconfigures it
+    cache = result_cache.get_cache()
+    current_size = min(max(cache.max_bytes // (1024 * 1024), 10), 1000)
+    current_spill = cache.spill_dir is not None
+    cache_size = st.slider(
+        get_translation(current_language, "Cache Size (MB)"), 10, 1000, current_size
+    )
+    spill_cache = st.checkbox(
+        get_translation(current_language, "Spill cache to disk"),
+        value=current_spill
+    )
+    if cache_size != current_size or spill_cache != current_spill:
+        cache.configure(
+            cache_size * 1024 * 1024,
+            (cache.spill_dir or result_cache.DEFAULT_SPILL_DIR) if spill_cache else None
+        )
+    max_threads = st.slider(
+        get_translation(current_language, "Max Threads"), 1, 16,
+        st.session_state.get("max_workers", 4)
+    )
+    # Stored outside the widget key so the value survives navigating away from Settings
+    st.session_state.max_workers = max_threads
     
     # معلومات النظام
     st.subheader(get_translation(current_language, "System Information"))
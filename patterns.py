@@ -0,0 +1,130 @@
+import string
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# Format masks: '#' digit, '?' uppercase letter, '*' uppercase letter or digit;
+# '\' makes the next character literal, anything else is copied as is
+MASK_CLASSES = {
+    "#": string.digits,
+    "?": string.ascii_uppercase,
+    "*": string.ascii_uppercase + string.digits,
+}
+
+# The regex subset only produces fixed-width values: literals, escapes, '.',
+# [classes] with ranges, and exact repeats {n}
+REGEX_ESCAPES = {
+    "d": string.digits,
+    "w": string.ascii_letters + string.digits + "_",
+    "s": " ",
+}
+REGEX_ANY = string.ascii_letters + string.digits
+MAX_REPEAT = 256
+
+class CompiledPattern(NamedTuple):
+    """Fixed-width pattern: a literal template plus an alphabet per variable position"""
+    template: np.ndarray   # uint8 bytes with literals in place
+    positions: np.ndarray  # indices of the variable positions
+    sizes: np.ndarray      # alphabet size per variable position
+    alphabets: np.ndarray  # (variable positions, largest alphabet) uint8 lookup table
+
+    @property
+    def width(self) -> int:
+        return len(self.template)
+
+def _parse_mask(mask: str) -> List[str]:
+    alphabets = []
+    chars = iter(mask)
+    for char in chars:
+        if char == "\\":
+            char = next(chars, None)
+            if char is None:
+                raise ValueError(f"Pattern '{mask}' ends with an unfinished escape")
+            alphabets.append(char)
+        else:
+            alphabets.append(MASK_CLASSES.get(char, char))
+    return alphabets
+
+def _parse_class(regex: str, index: int) -> Tuple[str, int]:
+    """Parse '[...]' starting after the '['; returns the alphabet and the index after ']'"""
+    members = []
+    while index < len(regex) and regex[index] != "]":
+        char = regex[index]
+        if char == "\\":
+            index += 1
+            if index == len(regex):
+                break
+            char = regex[index]
+            if char in REGEX_ESCAPES:
+                members.extend(REGEX_ESCAPES[char])
+                index += 1
+                continue
+        if index + 2 < len(regex) and regex[index + 1] == "-" and regex[index + 2] != "]":
+            low, high = char, regex[index + 2]
+            if ord(low) > ord(high):
+                raise ValueError(f"Bad range {low}-{high} in pattern '{regex}'")
+            members.extend(chr(code) for code in range(ord(low), ord(high) + 1))
+            index += 3
+        else:
+            members.append(char)
+            index += 1
+    if index == len(regex):
+        raise ValueError(f"Unclosed character class in pattern '{regex}'")
+    return "".join(dict.fromkeys(members)), index + 1
+
+def _parse_regex(regex: str) -> List[str]:
+    alphabets: List[str] = []
+    index = 0
+    while index < len(regex):
+        char = regex[index]
+        if char == "\\":
+            index += 1
+            if index == len(regex):
+                raise ValueError(f"Pattern '{regex}' ends with an unfinished escape")
+            char = regex[index]
+            alphabets.append(REGEX_ESCAPES.get(char, char))
+            index += 1
+        elif char == "[":
+            if regex.startswith("[^", index):
+                raise ValueError(f"Negated classes are not supported in pattern '{regex}'")
+            alphabet, index = _parse_class(regex, index + 1)
+            alphabets.append(alphabet)
+        elif char == ".":
+            alphabets.append(REGEX_ANY)
+            index += 1
+        elif char == "{":
+            end = regex.find("}", index)
+            count = regex[index + 1:end] if end != -1 else ""
+            if not alphabets or not count.isdigit():
+                raise ValueError(f"Only exact repeats such as {{3}} are supported in pattern '{regex}'")
+            if int(count) > MAX_REPEAT:
+                raise ValueError(f"Repeat {{{count}}} is too long in pattern '{regex}'")
+            alphabets[-1:] = [alphabets[-1]] * int(count)
+            index = end + 1
+        elif char in "^$" and (index == 0 or index == len(regex) - 1):
+            # Anchors are implied: every value matches the whole pattern
+            index += 1
+        elif char in "*+?|()":
+            raise ValueError(f"'{char}' is not supported in pattern '{regex}'; values must have a fixed width")
+        else:
+            alphabets.append(char)
+            index += 1
+    return alphabets
+
+@lru_cache(maxsize=256)
+def compile_pattern(pattern: Optional[str] = None, regex: Optional[str] = None) -> CompiledPattern:
+    """Compile a format mask or a fixed-width regex into per-position alphabets"""
+    alphabets = _parse_regex(regex) if regex is not None else _parse_mask(pattern or "")
+    if not alphabets:
+        raise ValueError("Pattern must produce at least one character")
+    for alphabet in alphabets:
+        if not alphabet or not alphabet.isascii():
+            raise ValueError(f"Pattern '{regex or pattern}' must produce ASCII characters only")
+    template = np.frombuffer("".join(alphabet[0] for alphabet in alphabets).encode("ascii"), dtype=np.uint8).copy()
+    variable = [index for index, alphabet in enumerate(alphabets) if len(alphabet) > 1]
+    sizes = np.array([len(alphabets[index]) for index in variable], dtype=np.int64)
+    table = np.zeros((len(variable), int(sizes.max()) if len(variable) else 0), dtype=np.uint8)
+    for row, index in enumerate(variable):
+        table[row, :len(alphabets[index])] = np.frombuffer(alphabets[index].encode("ascii"), dtype=np.uint8)
+    return CompiledPattern(template, np.array(variable, dtype=np.int64), sizes, table)
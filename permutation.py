@@ -0,0 +1,57 @@
+import zlib
+import numpy as np
+
+FEISTEL_ROUNDS = 4
+_UNIQUE_STREAM = 0x756E6971  # keeps permutation keys apart from batch seed streams
+
+_MIX_1 = np.uint64(0x9E3779B97F4A7C15)
+_MIX_2 = np.uint64(0xBF58476D1CE4E5B9)
+
+def permutation_key(seed: int, name: str) -> np.ndarray:
+    """Derive round keys for a field; identical in every batch and worker"""
+    sequence = np.random.SeedSequence(seed, spawn_key=(_UNIQUE_STREAM, zlib.crc32(name.encode()), 0))
+    return sequence.generate_state(FEISTEL_ROUNDS, dtype=np.uint64)
+
+class FeistelPermutation:
+    """Keyed bijection over [0, domain) evaluated on whole arrays"""
+
+    def __init__(self, domain: int, key: np.ndarray):
+        if domain < 1 or domain > 2 ** 64:
+            raise ValueError(f"Permutation domain must be in [1, 2**64], got {domain}")
+        self.domain = domain
+        self.half_bits = max(1, ((domain - 1).bit_length() + 1) // 2)
+        self.mask = np.uint64((1 << self.half_bits) - 1)
+        self.keys = np.asarray(key, dtype=np.uint64)
+
+    def _round(self, right: np.ndarray, key: np.uint64) -> np.ndarray:
+        x = (right ^ key) * _MIX_1
+        x ^= x >> np.uint64(29)
+        x *= _MIX_2
+        x ^= x >> np.uint64(32)
+        return x & self.mask
+
+    def _encrypt(self, values: np.ndarray) -> np.ndarray:
+        shift = np.uint64(self.half_bits)
+        left = values >> shift
+        right = values & self.mask
+        for key in self.keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << shift) | right
+
+    def __call__(self, indices: np.ndarray) -> np.ndarray:
+        values = self._encrypt(np.asarray(indices, dtype=np.uint64))
+        if self.domain == 2 ** (2 * self.half_bits):
+            return values
+        # Cycle walking: re-encrypt values outside the domain until they land inside
+        limit = np.uint64(self.domain - 1)
+        outside = np.flatnonzero(values > limit)
+        while outside.size:
+            values[outside] = self._encrypt(values[outside])
+            outside = outside[values[outside] > limit]
+        return values
+
+def blocked_permutation(indices: np.ndarray, permutation: FeistelPermutation) -> np.ndarray:
+    """Shuffle indices within blocks of permutation.domain so results stay close to the row count"""
+    indices = np.asarray(indices, dtype=np.uint64)
+    block = np.uint64(permutation.domain)
+    return (indices // block) * block + permutation(indices % block)
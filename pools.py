@@ -0,0 +1,117 @@
+import re
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from collections import Counter
+from functools import lru_cache
+from typing import Optional, Sequence
+
+DEFAULT_LOCALE = "en_US"
+POOL_DRAWS = 1000
+MAX_POOL_SIZE = 10000
+POOL_CACHE_SIZE = 8
+
+_LETTERS = pa.array(list("abcdefghijklmnopqrstuvwxyz"), type=pa.string())
+_NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]")
+
+def _to_ascii_token(value: str) -> str:
+    """Lowercase ASCII form of a name, as Faker uses in user names"""
+    from faker.decode import unidecode
+    return _NON_ALPHANUMERIC.sub("", unidecode(value).lower())
+
+class ValuePool:
+    """Deduplicated vocabulary sampled by index with Faker's element weights"""
+
+    def __init__(
+        self,
+        values: Sequence[str],
+        weights: Optional[Sequence[float]] = None,
+        max_size: int = MAX_POOL_SIZE
+    ):
+        totals: Counter = Counter()
+        for value, weight in zip(values, weights if weights is not None else [1.0] * len(values)):
+            totals[value] += weight
+        entries = totals.most_common(max_size)
+        cumulative = np.cumsum([weight for _, weight in entries], dtype=np.float64)
+        self.values = pa.array([value for value, _ in entries], type=pa.string())
+        self.ascii_values = pa.array(
+            [_to_ascii_token(value) or "user" for value, _ in entries], type=pa.string()
+        )
+        self.cumulative = cumulative / cumulative[-1]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def sample_indices(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        indices = np.searchsorted(self.cumulative, rng.random(size), side="right")
+        return np.minimum(indices, len(self.values) - 1)
+
+def _provider_pool(faker, provider_name: str, attribute: str, method: str, draws: int) -> ValuePool:
+    """Read a provider's element list directly, falling back to bounded Faker draws"""
+    provider = faker.provider(provider_name)
+    elements = getattr(provider, attribute, None) if provider is not None else None
+    if isinstance(elements, dict) and elements:
+        return ValuePool(list(elements), list(elements.values()))
+    if elements:
+        return ValuePool(list(elements))
+    return ValuePool([getattr(faker, method)() for _ in range(draws)])
+
+class ValuePools:
+    """First name, last name and email domain pools for one locale and seed"""
+
+    def __init__(self, locale: str, seed: int, draws: int = POOL_DRAWS):
+        from faker import Faker
+
+        faker = Faker(locale)
+        faker.seed_instance(seed)
+        self.locale = locale
+        self.seed = seed
+        self.first_names = _provider_pool(faker, "faker.providers.person", "first_names", "first_name", draws)
+        self.last_names = _provider_pool(faker, "faker.providers.person", "last_names", "last_name", draws)
+        # Faker picks a free email domain for half of its emails and a generated domain otherwise
+        free_domains = list(faker.provider("faker.providers.internet").free_email_domains)
+        generated_domains = [faker.domain_name() for _ in range(draws)]
+        self.domains = ValuePool(
+            free_domains + generated_domains,
+            [draws / len(free_domains)] * len(free_domains) + [1.0] * draws
+        )
+
+@lru_cache(maxsize=POOL_CACHE_SIZE)
+def get_pools(locale: str = DEFAULT_LOCALE, seed: int = 0) -> ValuePools:
+    """Build value pools once per locale and seed; cached for the life of the process"""
+    return ValuePools(locale, seed)
+
+def sample_names(pools: ValuePools, batch_size: int, rng: np.random.Generator) -> pa.Array:
+    """Compose full names column-wise from sampled first and last names, dictionary-encoded"""
+    first = pools.first_names.values.take(pools.first_names.sample_indices(rng, batch_size))
+    last = pools.last_names.values.take(pools.last_names.sample_indices(rng, batch_size))
+    return pc.dictionary_encode(pc.binary_join_element_wise(first, last, " "))
+
+def sample_emails(
+    pools: ValuePools,
+    batch_size: int,
+    rng: np.random.Generator,
+    suffixes: Optional[np.ndarray] = None
+) -> pa.Array:
+    """Compose emails column-wise following Faker's user name formats"""
+    first = pools.first_names.ascii_values.take(pools.first_names.sample_indices(rng, batch_size))
+    last = pools.last_names.ascii_values.take(pools.last_names.sample_indices(rng, batch_size))
+    domain = pools.domains.values.take(pools.domains.sample_indices(rng, batch_size))
+    digits = pc.utf8_lpad(
+        pc.cast(pa.array(rng.integers(0, 100, batch_size)), pa.string()), width=2, padding="0"
+    )
+    letter = _LETTERS.take(rng.integers(0, len(_LETTERS), batch_size))
+
+    # Faker user name formats: last.first, first.last, ?last, first##. With unique
+    # suffixes the digit format is skipped so each user name ends in exactly its suffix
+    format_count = 4 if suffixes is None else 3
+    user_name = pc.choose(
+        pa.array(rng.integers(0, format_count, batch_size, dtype=np.int8)),
+        pc.binary_join_element_wise(last, first, "."),
+        pc.binary_join_element_wise(first, last, "."),
+        pc.binary_join_element_wise(letter, last, ""),
+        pc.binary_join_element_wise(first, digits, ""),
+    )
+    if suffixes is not None:
+        user_name = pc.binary_join_element_wise(user_name, pc.cast(pa.array(suffixes), pa.string()), "")
+    return pc.binary_join_element_wise(user_name, domain, "@")
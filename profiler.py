@@ -0,0 +1,335 @@
+import os
+import re
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from data_models import DataField, DataModel, FieldType
+
+DEFAULT_BATCH_ROWS = 65536
+CSV_BLOCK_BYTES = 16 * 1024 * 1024
+HLL_PRECISION = 14  # 16 KiB of registers per column, about 0.8% standard error
+SAMPLE_SIZE = 8192
+TOP_K = 1000  # values counted exactly per column; columns with more are not categories
+MAX_CATEGORIES = 100
+QUANTILE_POINTS = 101
+UNIQUE_RATIO = 0.99
+MAX_PATTERN_WIDTH = 64
+MAX_DECIMALS = 6
+# Share of sampled values that must look like "First Last" and of their words found in the name pools
+NAME_SHAPE_RATE = 0.9
+NAME_VOCABULARY_RATE = 0.5
+
+_UUID = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+_EMAIL = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+# Two or three capitalized words, allowing names such as O'Brien, McKay and Smith-Jones
+_PERSON_NAME = re.compile(r"[^\W\d_][\w'.-]*(?: [^\W\d_][\w'.-]*){1,2}")
+
+def _hash(values: pa.Array) -> np.ndarray:
+    """64-bit hashes of non-null values; dictionaries are hashed once and gathered"""
+    import pandas as pd
+
+    if pa.types.is_dictionary(values.type):
+        return _hash(values.dictionary)[values.indices.to_numpy(zero_copy_only=False)]
+    return pd.util.hash_array(values.to_numpy(zero_copy_only=False))
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch with 2**precision registers"""
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, hashes: np.ndarray):
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        # A sentinel bit below the shifted hash bounds the rank of an all-zero remainder
+        rest = (hashes << np.uint64(self.precision)) | np.uint64(1 << (self.precision - 1))
+        rank = 65 - np.frexp(rest.astype(np.float64))[1]
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def estimate(self) -> int:
+        registers = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / registers)
+        raw = alpha * registers ** 2 / np.sum(np.ldexp(1.0, -self.registers.astype(np.int32)))
+        zeros = np.count_nonzero(self.registers == 0)
+        if raw <= 2.5 * registers and zeros:
+            # Linear counting is more accurate while many registers are still empty
+            return int(round(registers * np.log(registers / zeros)))
+        return int(round(raw))
+
+class BottomKSample:
+    """Uniform sample without replacement: the values with the k smallest random priorities"""
+
+    def __init__(self, size: int = SAMPLE_SIZE, seed: int = 0):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.values: Optional[np.ndarray] = None
+        self.priorities = np.empty(0)
+
+    def add(self, values: np.ndarray):
+        priorities = self.rng.random(len(values))
+        if self.values is not None:
+            values = np.concatenate([self.values, values])
+            priorities = np.concatenate([self.priorities, priorities])
+        if len(values) > self.size:
+            keep = np.argpartition(priorities, self.size)[:self.size]
+            values, priorities = values[keep], priorities[keep]
+        self.values, self.priorities = values, priorities
+
+class ColumnProfile:
+    """Single-pass statistics for one column in bounded memory"""
+
+    def __init__(self, name: str, arrow_type: pa.DataType, seed: int = 0):
+        self.name = name
+        self.type = arrow_type.value_type if pa.types.is_dictionary(arrow_type) else arrow_type
+        self.count = 0
+        self.nulls = 0
+        self.true_count = 0
+        self.min: Any = None
+        self.max: Any = None
+        self.min_length: Optional[int] = None
+        self.max_length: Optional[int] = None
+        self.hll = HyperLogLog()
+        self.sample = BottomKSample(seed=seed)
+        self.counts: Optional[Dict[Any, int]] = {}
+
+    @property
+    def is_string(self) -> bool:
+        return pa.types.is_string(self.type) or pa.types.is_large_string(self.type)
+
+    def add(self, values: pa.Array):
+        self.count += len(values)
+        self.nulls += values.null_count
+        values = values.drop_null()
+        if len(values) == 0:
+            return
+        self.hll.add(_hash(values))
+        if pa.types.is_dictionary(values.type):
+            values = values.dictionary_decode()
+        if pa.types.is_boolean(self.type):
+            self.true_count += pc.sum(values).as_py()
+        elif self.is_string:
+            lengths = pc.min_max(pc.utf8_length(values)).as_py()
+            self._extend("min_length", "max_length", lengths["min"], lengths["max"])
+        else:
+            bounds = pc.min_max(values).as_py()
+            self._extend("min", "max", bounds["min"], bounds["max"])
+        self.sample.add(values.to_numpy(zero_copy_only=False))
+        self._count_values(values)
+
+    def _extend(self, low_name: str, high_name: str, low: Any, high: Any):
+        if getattr(self, low_name) is None or low < getattr(self, low_name):
+            setattr(self, low_name, low)
+        if getattr(self, high_name) is None or high > getattr(self, high_name):
+            setattr(self, high_name, high)
+
+    def _count_values(self, values: pa.Array):
+        # Exact frequencies while the column looks categorical, dropped for good once it does not
+        if self.counts is None:
+            return
+        value_counts = pc.value_counts(values)
+        if len(value_counts) + len(self.counts) > TOP_K:
+            self.counts = None
+            return
+        for value, count in zip(value_counts.field("values").to_pylist(), value_counts.field("counts").to_pylist()):
+            self.counts[value] = self.counts.get(value, 0) + count
+
+    @property
+    def non_null(self) -> int:
+        return self.count - self.nulls
+
+    @property
+    def distinct(self) -> int:
+        if self.counts is not None:
+            return len(self.counts)
+        return min(self.hll.estimate(), self.non_null)
+
+    def summary(self) -> Dict[str, Any]:
+        """Observed statistics, stored with the model for reference"""
+        return {
+            "arrow_type": str(self.type),
+            "count": self.count,
+            "nulls": self.nulls,
+            "distinct": self.distinct,
+            "min": str(self.min) if self.min is not None else None,
+            "max": str(self.max) if self.max is not None else None,
+            "min_length": self.min_length,
+            "max_length": self.max_length,
+        }
+
+def _decimals(sample: np.ndarray) -> int:
+    for decimals in range(MAX_DECIMALS + 1):
+        if np.allclose(np.round(sample, decimals), sample, rtol=0, atol=10.0 ** -(MAX_DECIMALS + 2)):
+            return decimals
+    return MAX_DECIMALS
+
+def _quantiles(profile: ColumnProfile) -> List[float]:
+    quantiles = np.quantile(profile.sample.values.astype(np.float64), np.linspace(0, 1, QUANTILE_POINTS))
+    # The sample rarely holds the extremes, which the exact min/max do
+    quantiles[0], quantiles[-1] = profile.min, profile.max
+    return [float(value) for value in quantiles]
+
+def _name_vocabulary() -> Set[str]:
+    from pools import get_pools
+
+    pools = get_pools()
+    return set(pools.first_names.values.to_pylist()) | set(pools.last_names.values.to_pylist())
+
+def looks_like_names(sample: List[str]) -> bool:
+    """Whether sampled values are person names: capitalized words mostly found in the name pools"""
+    shaped = [
+        value for value in sample
+        if _PERSON_NAME.fullmatch(value) and all(word[0].isupper() for word in value.split())
+    ]
+    if not sample or len(shaped) < NAME_SHAPE_RATE * len(sample):
+        return False
+    vocabulary = _name_vocabulary()
+    words = [word for value in shaped for word in value.split()]
+    return sum(word in vocabulary for word in words) >= NAME_VOCABULARY_RATE * len(words)
+
+def infer_pattern(sample: List[str]) -> Optional[str]:
+    """Format mask shared by every sampled value, e.g. 'ORD-####', or None"""
+    if not sample or len({len(value) for value in sample}) != 1 or not 0 < len(sample[0]) <= MAX_PATTERN_WIDTH:
+        return None
+    mask = []
+    for chars in zip(*sample):
+        chars = set(chars)
+        if len(chars) == 1:
+            char = chars.pop()
+            if not char.isascii():
+                return None
+            mask.append("\\" + char if char in "#?*\\" else char)
+        elif all(char.isdigit() and char.isascii() for char in chars):
+            mask.append("#")
+        elif all(char.isupper() and char.isascii() for char in chars):
+            mask.append("?")
+        elif all((char.isupper() or char.isdigit()) and char.isascii() for char in chars):
+            mask.append("*")
+        else:
+            return None
+    return "".join(mask) if any(char in "#?*" for char in mask[-1:] + mask) else None
+
+def _string_field(profile: ColumnProfile, options: Dict[str, Any]) -> FieldType:
+    sample = profile.sample.values.tolist()
+    if profile.counts is not None and len(profile.counts) <= MAX_CATEGORIES and profile.distinct < profile.non_null:
+        ranked = sorted(profile.counts.items(), key=lambda item: -item[1])
+        options["categories"] = [value for value, _ in ranked]
+        options["weights"] = [round(count / profile.non_null, 6) for _, count in ranked]
+        return FieldType.CATEGORY
+    if all(_UUID.fullmatch(value) for value in sample):
+        return FieldType.UUID
+    if sum(bool(_EMAIL.fullmatch(value)) for value in sample) >= 0.95 * len(sample):
+        return FieldType.EMAIL
+    if looks_like_names(sample):
+        return FieldType.NAME
+    pattern = infer_pattern(sample)
+    if pattern is not None:
+        options["pattern"] = pattern
+        return FieldType.PATTERN
+    options["length"] = int(np.median([len(value) for value in sample]))
+    return FieldType.STRING
+
+def _field(profile: ColumnProfile, source: str) -> DataField:
+    """Map observed statistics onto a field whose options reproduce them"""
+    from generator import unique_value_space
+
+    options: Dict[str, Any] = {}
+    arrow_type = profile.type
+    if profile.non_null == 0:
+        field_type = FieldType.STRING
+    elif pa.types.is_integer(arrow_type):
+        field_type = FieldType.INTEGER
+        # Generated integers exclude max
+        options.update({"min": int(profile.min), "max": int(profile.max) + 1})
+        options["quantiles"] = _quantiles(profile)
+    elif pa.types.is_floating(arrow_type) or pa.types.is_decimal(arrow_type):
+        field_type = FieldType.FLOAT
+        options.update({"min": float(profile.min), "max": float(profile.max), "decimals": _decimals(profile.sample.values.astype(np.float64))})
+        options["quantiles"] = _quantiles(profile)
+    elif pa.types.is_boolean(arrow_type):
+        field_type = FieldType.BOOLEAN
+        options["probability"] = round(profile.true_count / profile.non_null, 6)
+    elif pa.types.is_date(arrow_type):
+        field_type = FieldType.DATE
+        options.update({"start": profile.min.isoformat(), "end": profile.max.isoformat()})
+    elif pa.types.is_timestamp(arrow_type):
+        field_type = FieldType.DATETIME
+        options.update({"start": profile.min.replace(tzinfo=None).isoformat(), "end": profile.max.replace(tzinfo=None).isoformat()})
+    elif profile.is_string:
+        field_type = _string_field(profile, options)
+    else:
+        field_type = FieldType.STRING
+    if profile.nulls:
+        options["null_rate"] = round(profile.nulls / profile.count, 6)
+
+    field = DataField(
+        name=profile.name,
+        description=f"Profiled from {source}: {profile.distinct:,} distinct of {profile.non_null:,} values",
+        type=field_type,
+        required=profile.nulls == 0,
+        options=options
+    )
+    # Near-unique columns stay unique when their value space can hold every row
+    if profile.non_null > 1 and profile.distinct >= UNIQUE_RATIO * profile.non_null and field_type in (
+        FieldType.UUID, FieldType.INTEGER, FieldType.EMAIL, FieldType.PATTERN, FieldType.STRING
+    ):
+        # Unique values are a permutation of the range, so the distribution does not apply
+        candidate = field.copy(unique=True, options={key: value for key, value in options.items() if key != "quantiles"})
+        space = unique_value_space(candidate)
+        if space is None or space >= profile.non_null:
+            field = candidate
+    return field
+
+def _read_batches(path: str, format_type: str, batch_rows: int) -> Iterator[pa.RecordBatch]:
+    if format_type == "parquet":
+        yield from pq.ParquetFile(path).iter_batches(batch_size=batch_rows)
+    elif format_type == "csv":
+        # Compressed CSV (.csv.gz, .csv.zst) is decompressed on the fly
+        # Empty fields are nulls, as the CSV exporter writes them
+        yield from pa_csv.open_csv(
+            path,
+            read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_BYTES),
+            convert_options=pa_csv.ConvertOptions(strings_can_be_null=True)
+        )
+    else:
+        raise ValueError(f"Profiling supports CSV and Parquet files, not {format_type}")
+
+def profile_file(
+    path: str,
+    format_type: Optional[str] = None,
+    name: Optional[str] = None,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    progress_callback: Optional[Callable[[int], None]] = None
+) -> DataModel:
+    """Scan a CSV or Parquet file once and fit a DataModel that generates look-alike data"""
+    from exporter import format_for_path
+
+    format_type = format_type or format_for_path(path)[0]
+    if format_type is None:
+        raise ValueError(f"Cannot infer the file format of '{path}'")
+    source = os.path.basename(path)
+    profiles: Optional[List[ColumnProfile]] = None
+    rows = 0
+    for batch in _read_batches(path, format_type, batch_rows):
+        if profiles is None:
+            profiles = [ColumnProfile(field.name, field.type, seed) for seed, field in enumerate(batch.schema)]
+        for profile, column in zip(profiles, batch.columns):
+            profile.add(column)
+        rows += batch.num_rows
+        if progress_callback:
+            progress_callback(rows)
+    if profiles is None:
+        raise ValueError(f"'{path}' has no rows to profile")
+
+    return DataModel(
+        name=name or os.path.splitext(source)[0].split(".")[0],
+        description=f"Fitted from {source} ({rows:,} rows)",
+        category="Profiled",
+        tags=["profiled"],
+        fields=[_field(profile, source) for profile in profiles],
+        schema={"source": path, "rows": rows, "columns": {profile.name: profile.summary() for profile in profiles}}
+    )
@@ -0,0 +1,196 @@
+import os
+import re
+import zlib
+from graphlib import CycleError, TopologicalSorter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+from data_models import DataModel, Dataset, ForeignKey
+from exporter import FILE_EXTENSIONS, export_data, write_export
+from generator import _apply_null_mask, _arrow_type, block_rng, generate_data_iter, row_blocks, stream_key
+from permutation import FeistelPermutation, permutation_key
+
+_MODEL_STREAM = 0x6D6F646C  # per-model seeds inside a dataset
+_FOREIGN_KEY_STREAM = "foreign_key:"  # keeps foreign-key draws apart from field streams
+
+def dataset_order(dataset: Dataset) -> List[str]:
+    """Model names with every parent before its children"""
+    names = {model.name for model in dataset.models}
+    graph: Dict[str, set] = {name: set() for name in names}
+    for link in dataset.foreign_keys:
+        child = dataset.get_model(link.model)
+        parent = dataset.get_model(link.parent_model)
+        if link.field not in child.field_names:
+            raise ValueError(f"Model '{child.name}' has no field '{link.field}'")
+        if link.parent_field not in parent.field_names:
+            raise ValueError(f"Model '{parent.name}' has no field '{link.parent_field}'")
+        if link.skew < 0:
+            raise ValueError(f"Skew for {link.model}.{link.field} must be non-negative")
+        graph[link.model].add(link.parent_model)
+    try:
+        return list(TopologicalSorter(graph).static_order())
+    except CycleError as e:
+        raise ValueError(f"Foreign keys in dataset '{dataset.name}' form a cycle: {e.args[1]}") from e
+
+def dataset_rows(dataset: Dataset, order: Optional[List[str]] = None) -> Dict[str, int]:
+    """Row count per model: explicit counts, else parent rows times the link's fan-out"""
+    rows: Dict[str, int] = {}
+    for name in order or dataset_order(dataset):
+        if name in dataset.rows:
+            rows[name] = dataset.rows[name]
+            continue
+        fanouts = [link for link in dataset.foreign_keys if link.model == name and link.fanout is not None]
+        if not fanouts:
+            raise ValueError(f"Dataset '{dataset.name}' needs a row count or a fan-out for '{name}'")
+        rows[name] = int(round(rows[fanouts[0].parent_model] * fanouts[0].fanout))
+    return rows
+
+def _model_seed(entropy: int, name: str) -> int:
+    sequence = np.random.SeedSequence(entropy, spawn_key=(_MODEL_STREAM, zlib.crc32(name.encode())))
+    return int(sequence.generate_state(1, dtype=np.uint64)[0])
+
+class ParentSampler:
+    """Draw parent row indices for a foreign key, uniformly or with Zipf skew"""
+
+    def __init__(self, parent_rows: int, skew: float, key: np.ndarray):
+        if parent_rows < 1:
+            raise ValueError("Cannot reference an empty parent table")
+        self.parent_rows = parent_rows
+        self.skew = skew
+        if skew > 0:
+            weights = np.arange(1, parent_rows + 1, dtype=np.float64) ** -skew
+            self.cumulative = np.cumsum(weights)
+            self.cumulative /= self.cumulative[-1]
+            self.permutation = FeistelPermutation(parent_rows, key)
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        if self.skew <= 0:
+            return rng.integers(0, self.parent_rows, size)
+        ranks = np.searchsorted(self.cumulative, rng.random(size), side="right")
+        np.minimum(ranks, self.parent_rows - 1, out=ranks)
+        # Scatter the popular ranks over the parent table rather than its first rows
+        return self.permutation(ranks).astype(np.int64)
+
+def _key_array(chunks: List[pa.Array]) -> pa.Array:
+    """Concatenate a collected key column, decoding dictionaries so one array serves every batch"""
+    chunks = [chunk.dictionary_decode() if pa.types.is_dictionary(chunk.type) else chunk for chunk in chunks]
+    return pa.concat_arrays(chunks)
+
+def _model_batches(
+    model: DataModel,
+    rows: int,
+    seed: int,
+    batch_size: int,
+    max_workers: int,
+    links: Dict[str, ForeignKey],
+    samplers: Dict[str, ParentSampler],
+    keys: Dict[Tuple[str, str], pa.Array],
+    key_fields: List[str]
+) -> Iterator[pa.RecordBatch]:
+    """Generate a model's own fields in the pool and fill foreign keys here from the parent keys"""
+    base = model.copy(update={"fields": [field for field in model.fields if field.name not in links]})
+    parent_keys = {name: keys[(link.parent_model, link.parent_field)] for name, link in links.items()}
+    schema = pa.schema([
+        (field.name, parent_keys[field.name].type if field.name in links else _arrow_type(field))
+        for field in model.fields
+    ])
+    stream_keys = {name: stream_key(seed, _FOREIGN_KEY_STREAM + name) for name in links}
+    collected: Dict[str, List[pa.Array]] = {name: [] for name in key_fields}
+    # The block last drawn per foreign key; batches smaller than a block reuse it instead of redrawing
+    drawn: Dict[str, Tuple[int, pa.Array]] = {}
+
+    def block_values(field, block: int, block_rows: int) -> pa.Array:
+        if field.name not in drawn or drawn[field.name][0] != block:
+            # Drawn per row block like every other column, so foreign keys are row-addressable too
+            rng = block_rng(stream_keys[field.name], block)
+            indices = samplers[field.name].sample(rng, block_rows)
+            values = _apply_null_mask(field, parent_keys[field.name].take(pa.array(indices)), rng)
+            drawn[field.name] = (block, values)
+        return drawn[field.name][1]
+
+    for batch_num, batch in enumerate(generate_data_iter(base, rows, batch_size, seed, None, max_workers)):
+        start = batch_num * batch_size
+        stop = min(start + batch_size, rows)
+        columns = []
+        for field in model.fields:
+            if field.name in links:
+                chunks = []
+                for block, block_start, block_rows in row_blocks(start, stop, rows):
+                    low, high = max(start, block_start), min(stop, block_start + block_rows)
+                    chunks.append(block_values(field, block, block_rows).slice(low - block_start, high - low))
+                values = pa.concat_arrays(chunks) if len(chunks) > 1 else chunks[0]
+            else:
+                values = batch.column(field.name)
+            columns.append(values)
+        batch = pa.RecordBatch.from_arrays(columns, schema=schema)
+        for name in key_fields:
+            collected[name].append(batch.column(name))
+        yield batch
+
+    for name, chunks in collected.items():
+        keys[(model.name, name)] = _key_array(chunks) if chunks else pa.array([], type=schema.field(name).type)
+
+def generate_dataset_iter(
+    dataset: Dataset,
+    seed: Optional[int] = None,
+    batch_size: int = 10000,
+    max_workers: int = 4
+) -> Iterator[Tuple[DataModel, int, Iterator[pa.RecordBatch]]]:
+    """Yield (model, rows, batches) in dependency order; consume each table before the next"""
+    entropy = seed if seed is not None else np.random.SeedSequence().entropy
+    order = dataset_order(dataset)
+    rows = dataset_rows(dataset, order)
+    # Only referenced key columns are kept, never whole parent tables
+    referenced: Dict[str, List[str]] = {}
+    for link in dataset.foreign_keys:
+        fields = referenced.setdefault(link.parent_model, [])
+        if link.parent_field not in fields:
+            fields.append(link.parent_field)
+    keys: Dict[Tuple[str, str], pa.Array] = {}
+
+    for name in order:
+        model = dataset.get_model(name)
+        model_seed = _model_seed(entropy, name)
+        links = {link.field: link for link in dataset.foreign_keys if link.model == name}
+        samplers = {}
+        for field_name, link in links.items():
+            if (link.parent_model, link.parent_field) not in keys:
+                raise RuntimeError(f"Table '{link.parent_model}' must be fully consumed before '{name}'")
+            samplers[field_name] = ParentSampler(
+                rows[link.parent_model], link.skew, permutation_key(model_seed, field_name)
+            )
+        yield model, rows[name], _model_batches(
+            model, rows[name], model_seed, batch_size, max_workers,
+            links, samplers, keys, referenced.get(name, [])
+        )
+
+def table_name(model: DataModel) -> str:
+    """File and table name for a model, e.g. 'Customer Data' -> 'customer_data'"""
+    return re.sub(r"[^0-9a-z]+", "_", model.name.lower()).strip("_")
+
+def export_dataset(
+    dataset: Dataset,
+    format_type: str,
+    target: str,
+    seed: Optional[int] = None,
+    batch_size: int = 10000,
+    max_workers: int = 4
+) -> Dict[str, str]:
+    """Stream every table to files in a directory, or to tables when format_type is 'sql'"""
+    outputs = {}
+    for model, _, batches in generate_dataset_iter(dataset, seed, batch_size, max_workers):
+        name = table_name(model)
+        if format_type == "sql":
+            export_data(batches, "sql", name, target.split(":", 1)[0], target)
+            outputs[model.name] = name
+        elif format_type in FILE_EXTENSIONS:
+            os.makedirs(target, exist_ok=True)
+            path = os.path.join(target, f"{name}.{FILE_EXTENSIONS[format_type]}")
+            with open(path, "wb") as f:
+                write_export(batches, format_type, f)
+            outputs[model.name] = path
+        else:
+            raise ValueError(f"Unsupported export format: {format_type}")
+    return outputs
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from data_models import DataModel
+
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+DEFAULT_SPILL_MAX_BYTES = 1024 * 1024 * 1024
+DEFAULT_SPILL_DIR = os.path.join(tempfile.gettempdir(), "data_generator_cache")
+
+def fingerprint(model: DataModel, **params: Any) -> str:
+    """Cheap cache key from the model definition and generation parameters, never the data"""
+    payload = json.dumps({"model": model.dict(), "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def derive_key(key: str, **params: Any) -> str:
+    """Key for a result derived from a cached dataset, e.g. one export format"""
+    payload = json.dumps({"parent": key, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ResultCache:
+    """LRU cache of export bytes under a byte budget, with optional disk spill; datasets live in dataset_store"""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        spill_dir: Optional[str] = None,
+        spill_max_bytes: int = DEFAULT_SPILL_MAX_BYTES
+    ):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.spill_max_bytes = spill_max_bytes
+        self._memory: "OrderedDict[str, Tuple[bytes, int]]" = OrderedDict()
+        self._disk: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.RLock()
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._memory_bytes
+
+    def configure(self, max_bytes: int, spill_dir: Optional[str] = None):
+        """Apply a new budget and spill setting, evicting as needed"""
+        with self._lock:
+            self.max_bytes = max_bytes
+            if spill_dir != self.spill_dir:
+                self._clear_disk()
+                self.spill_dir = spill_dir
+            self._evict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key][0]
+            if key in self._disk:
+                path, nbytes = self._disk.pop(key)
+                self._disk_bytes -= nbytes
+                with open(path, "rb") as f:
+                    value = f.read()
+                os.remove(path)
+                self.put(key, value)
+                return value
+        return None
+
+    def put(self, key: str, value: bytes):
+        if not isinstance(value, (bytes, bytearray)):
+            raise TypeError(f"Cannot cache values of type {type(value).__name__}")
+        nbytes = len(value)
+        with self._lock:
+            self._discard(key)
+            self._memory[key] = (value, nbytes)
+            self._memory_bytes += nbytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self._clear_disk()
+
+    def _discard(self, key: str):
+        if key in self._memory:
+            self._memory_bytes -= self._memory.pop(key)[1]
+        if key in self._disk:
+            path, nbytes = self._disk.pop(key)
+            self._disk_bytes -= nbytes
+            os.remove(path)
+
+    def _evict(self):
+        while self._memory_bytes > self.max_bytes and self._memory:
+            key, (value, nbytes) = self._memory.popitem(last=False)
+            self._memory_bytes -= nbytes
+            if self.spill_dir is not None:
+                self._spill(key, value)
+
+    def _spill(self, key: str, value: bytes):
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = os.path.join(self.spill_dir, f"{key}.bin")
+        with open(path, "wb") as f:
+            f.write(value)
+        nbytes = os.path.getsize(path)
+        self._disk[key] = (path, nbytes)
+        self._disk_bytes += nbytes
+        while self._disk_bytes > self.spill_max_bytes and self._disk:
+            _, (old_path, old_bytes) = self._disk.popitem(last=False)
+            self._disk_bytes -= old_bytes
+            os.remove(old_path)
+
+    def _clear_disk(self):
+        for path, _ in self._disk.values():
+            os.remove(path)
+        self._disk.clear()
+        self._disk_bytes = 0
+
+_cache = ResultCache()
+
+def get_cache() -> ResultCache:
+    """Process-wide cache shared by all sessions"""
+    return _cache
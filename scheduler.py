@@ -0,0 +1,78 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Deque, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Sized once for the machine; each run's max_workers caps how many of its tasks are in flight,
+# so concurrent runs with different settings share the pool instead of rebuilding it
+POOL_WORKERS = int(os.environ.get("DATA_GENERATOR_POOL_WORKERS", str(os.cpu_count() or 1)))
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def _mp_context():
+    """Avoid forking the (multi-threaded) Streamlit server process"""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return the persistent process pool, creating it on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=POOL_WORKERS, mp_context=_mp_context())
+        return _executor
+
+def _discard_executor(executor: ProcessPoolExecutor):
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+def shutdown_executor():
+    """Shut down the persistent process pool; registered to run at interpreter exit"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+atexit.register(shutdown_executor)
+
+def run_ordered(
+    func: Callable[[T], R],
+    tasks: Iterable[T],
+    max_workers: int,
+    max_in_flight: Optional[int] = None
+) -> Iterator[R]:
+    """Run tasks on the process pool and yield results in order with bounded in-flight work"""
+    if max_workers <= 1:
+        for task in tasks:
+            yield func(task)
+        return
+
+    executor = get_executor()
+    # Tasks in flight never exceed max_workers, which bounds this run's share of the pool
+    limit = min(max_in_flight or max_workers, max_workers)
+    pending: Deque[Future] = deque()
+    try:
+        for task in tasks:
+            pending.append(executor.submit(func, task))
+            if len(pending) >= limit:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    except BrokenProcessPool:
+        _discard_executor(executor)
+        raise
+    finally:
+        for future in pending:
+            future.cancel()
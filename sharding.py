@@ -0,0 +1,145 @@
+import glob
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from data_models import DataModel
+from exporter import write_export
+from generator import ROW_BLOCK_SIZE, generate_data_iter
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+DEFAULT_SHARD_ROWS = 1000000
+
+def plan_shards(rows: int, shard_rows: int) -> List[Dict[str, Any]]:
+    """Split a job into numbered row ranges, one Parquet part file each"""
+    if shard_rows < 1:
+        raise ValueError("Shard size must be at least one row")
+    return [
+        {"index": index, "start": start, "stop": min(start + shard_rows, rows), "file": f"part-{index:05d}.parquet"}
+        for index, start in enumerate(range(0, rows, shard_rows))
+    ]
+
+def _model_payload(model: DataModel) -> Dict[str, Any]:
+    # Round-trip through JSON so enums and the stored manifest compare equal
+    return json.loads(json.dumps(model.dict(), default=str))
+
+def load_manifest(output_dir: str) -> Optional[Dict[str, Any]]:
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _check_manifest(manifest: Dict[str, Any], output_dir: str, model: DataModel, rows: int, seed: Optional[int], shard_rows: int):
+    if manifest["version"] != MANIFEST_VERSION or manifest["block_rows"] != ROW_BLOCK_SIZE:
+        raise ValueError(f"Manifest in {output_dir} was written by an incompatible version")
+    same_job = (
+        manifest["model"] == _model_payload(model)
+        and manifest["rows"] == rows
+        and manifest["shard_rows"] == shard_rows
+        and (seed is None or manifest["seed"] == seed)
+    )
+    if not same_job:
+        raise ValueError(f"{output_dir} already holds a different job; use a new output directory")
+
+def create_manifest(
+    output_dir: str,
+    model: DataModel,
+    rows: int,
+    seed: Optional[int] = None,
+    shard_rows: int = DEFAULT_SHARD_ROWS
+) -> Dict[str, Any]:
+    """Write the job manifest, or return the existing one when it describes the same job"""
+    manifest = load_manifest(output_dir)
+    if manifest is not None:
+        _check_manifest(manifest, output_dir, model, rows, seed, shard_rows)
+        return manifest
+
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "model": _model_payload(model),
+        "rows": rows,
+        # Without a seed the job still needs one fixed value so every shard and restart agrees
+        "seed": seed if seed is not None else int(np.random.SeedSequence().entropy),
+        "shard_rows": shard_rows,
+        "block_rows": ROW_BLOCK_SIZE,
+        "shards": plan_shards(rows, shard_rows),
+    }
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    try:
+        # A hard link creates the manifest only if no other node has, and never half-written
+        os.link(temp_path, path)
+    except FileExistsError:
+        # Another node won the race: its seed is the job's seed
+        manifest = load_manifest(output_dir)
+        _check_manifest(manifest, output_dir, model, rows, seed, shard_rows)
+    finally:
+        os.remove(temp_path)
+    return manifest
+
+def shard_complete(output_dir: str, shard: Dict[str, Any]) -> bool:
+    """Part files appear only through an atomic rename, so existence means complete"""
+    return os.path.exists(os.path.join(output_dir, shard["file"]))
+
+def _write_shard(output_dir: str, model: DataModel, manifest: Dict[str, Any], shard: Dict[str, Any], batch_size: int, max_workers: int):
+    path = os.path.join(output_dir, shard["file"])
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    batches = generate_data_iter(
+        model,
+        manifest["rows"],
+        batch_size=batch_size,
+        seed=manifest["seed"],
+        max_workers=max_workers,
+        row_range=(shard["start"], shard["stop"])
+    )
+    try:
+        with open(temp_path, "wb") as f:
+            write_export(batches, "parquet", f)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def run_shards(
+    model: DataModel,
+    rows: int,
+    output_dir: str,
+    seed: Optional[int] = None,
+    shard_rows: int = DEFAULT_SHARD_ROWS,
+    batch_size: int = 10000,
+    max_workers: int = 4,
+    node_index: int = 0,
+    node_count: int = 1,
+    progress_callback: Optional[Callable[[float], None]] = None
+) -> Dict[str, int]:
+    """Generate this node's share of the shards, skipping parts finished by an earlier run"""
+    if not 0 <= node_index < node_count:
+        raise ValueError(f"Node index must be in [0, {node_count})")
+    manifest = create_manifest(output_dir, model, rows, seed, shard_rows)
+    shards = [shard for shard in manifest["shards"] if shard["index"] % node_count == node_index]
+
+    # Leftovers of a crashed run on this node's shards
+    for shard in shards:
+        for temp_path in glob.glob(os.path.join(output_dir, f"{shard['file']}.*.tmp")):
+            os.remove(temp_path)
+
+    written = skipped = 0
+    for shard_num, shard in enumerate(shards):
+        if shard_complete(output_dir, shard):
+            skipped += 1
+        else:
+            _write_shard(output_dir, model, manifest, shard, batch_size, max_workers)
+            written += 1
+        if progress_callback:
+            progress_callback((shard_num + 1) / len(shards))
+    complete = sum(shard_complete(output_dir, shard) for shard in manifest["shards"])
+    return {"shards": len(shards), "written": written, "skipped": skipped,
+            "complete": complete, "total": len(manifest["shards"])}
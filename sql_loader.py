@@ -0,0 +1,239 @@
+import io
+import os
+import tempfile
+import threading
+import uuid
+from collections import deque
+from itertools import chain
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Iterable
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import sqlalchemy
+
+DEFAULT_PARALLELISM = 4
+POOL_SIZE = 8
+
+_engines: Dict[str, sqlalchemy.engine.Engine] = {}
+_engines_lock = threading.Lock()
+
+def get_engine(connection_string: str) -> sqlalchemy.engine.Engine:
+    """Return a pooled engine per connection string, created once per process"""
+    with _engines_lock:
+        engine = _engines.get(connection_string)
+        if engine is None:
+            url = sqlalchemy.engine.make_url(connection_string)
+            kwargs = {"pool_pre_ping": True}
+            if url.get_backend_name() == "mysql":
+                kwargs["connect_args"] = {"local_infile": True}
+            if url.get_backend_name() != "sqlite":
+                kwargs.update(pool_size=POOL_SIZE, max_overflow=POOL_SIZE)
+            engine = sqlalchemy.create_engine(url, **kwargs)
+            _engines[connection_string] = engine
+        return engine
+
+def dispose_engines():
+    """Close every cached engine and its connection pool"""
+    with _engines_lock:
+        engines = list(_engines.values())
+        _engines.clear()
+    for engine in engines:
+        engine.dispose()
+
+def _column_type(data_type: pa.DataType) -> sqlalchemy.types.TypeEngine:
+    if pa.types.is_dictionary(data_type):
+        data_type = data_type.value_type
+    if pa.types.is_boolean(data_type):
+        return sqlalchemy.Boolean()
+    if pa.types.is_integer(data_type):
+        return sqlalchemy.BigInteger()
+    if pa.types.is_floating(data_type):
+        return sqlalchemy.Float()
+    if pa.types.is_date(data_type):
+        return sqlalchemy.Date()
+    if pa.types.is_timestamp(data_type):
+        return sqlalchemy.DateTime()
+    return sqlalchemy.Text()
+
+def _staging_table(schema: pa.Schema, table_name: str) -> sqlalchemy.Table:
+    return sqlalchemy.Table(
+        f"{table_name}__staging_{uuid.uuid4().hex[:8]}",
+        sqlalchemy.MetaData(),
+        *(sqlalchemy.Column(field.name, _column_type(field.type)) for field in schema)
+    )
+
+def _csv_bytes(batch: pa.RecordBatch) -> bytes:
+    buffer = io.BytesIO()
+    pa_csv.write_csv(batch, buffer, pa_csv.WriteOptions(include_header=False))
+    return buffer.getvalue()
+
+def _column_list(engine: sqlalchemy.engine.Engine, names: Iterable[str]) -> str:
+    quote = engine.dialect.identifier_preparer.quote
+    return ", ".join(quote(name) for name in names)
+
+def _copy_postgresql(engine: sqlalchemy.engine.Engine, table: sqlalchemy.Table, batch: pa.RecordBatch):
+    # CSV from Arrow: unquoted empty fields are NULL, quoted "" stays an empty string
+    quote = engine.dialect.identifier_preparer.quote
+    sql = f"COPY {quote(table.name)} ({_column_list(engine, batch.schema.names)}) FROM STDIN WITH (FORMAT csv)"
+    data = _csv_bytes(batch)
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        if engine.dialect.driver == "psycopg2":
+            cursor.copy_expert(sql, io.BytesIO(data))
+        else:
+            with cursor.copy(sql) as copy:
+                copy.write(data)
+        connection.commit()
+    finally:
+        connection.close()
+
+def _load_data_mysql(engine: sqlalchemy.engine.Engine, table: sqlalchemy.Table, batch: pa.RecordBatch):
+    # LOAD DATA reads booleans as integers and empty fields as '', so map both explicitly
+    columns = [
+        pc.cast(column, pa.int8()) if pa.types.is_boolean(column.type) else column
+        for column in batch.columns
+    ]
+    batch = pa.RecordBatch.from_arrays(columns, names=batch.schema.names)
+    quote = engine.dialect.identifier_preparer.quote
+    variables = ", ".join(f"@v{i}" for i in range(batch.num_columns))
+    assignments = ", ".join(
+        f"{quote(name)} = NULLIF(@v{i}, '')" for i, name in enumerate(batch.schema.names)
+    )
+    with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as chunk_file:
+        chunk_file.write(_csv_bytes(batch))
+    try:
+        path = chunk_file.name.replace("\\", "/")
+        sql = (
+            f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE {quote(table.name)} "
+            "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' LINES TERMINATED BY '\\n' "
+            f"({variables}) SET {assignments}"
+        )
+        connection = engine.raw_connection()
+        try:
+            connection.cursor().execute(sql)
+            connection.commit()
+        finally:
+            connection.close()
+    finally:
+        os.unlink(chunk_file.name)
+
+def _python_rows(batch: pa.RecordBatch) -> list:
+    # Temporal values go in as ISO text; DBAPI adapters for them are deprecated
+    columns = [
+        pc.cast(column, pa.string()) if pa.types.is_temporal(column.type) else column
+        for column in batch.columns
+    ]
+    return list(zip(*(column.to_pylist() for column in columns)))
+
+def _insert_generic(engine: sqlalchemy.engine.Engine, table: sqlalchemy.Table, batch: pa.RecordBatch):
+    with engine.begin() as connection:
+        connection.execute(table.insert(), batch.to_pylist())
+
+# Crash-unsafe but fast settings, used only for the duration of one load
+_SQLITE_LOAD_PRAGMAS = {"synchronous": "OFF", "journal_mode": "MEMORY", "cache_size": "-65536"}
+
+def _load_sqlite(engine: sqlalchemy.engine.Engine, table: sqlalchemy.Table, batches: Iterable[pa.RecordBatch]) -> int:
+    """SQLite has a single writer: executemany every chunk inside one transaction"""
+    quote = engine.dialect.identifier_preparer.quote
+    rows = 0
+    connection = engine.raw_connection()
+    cursor = connection.cursor()
+    # The connection goes back to the pool afterwards, so the fast settings must not outlive the load
+    saved = {pragma: cursor.execute(f"PRAGMA {pragma}").fetchone()[0] for pragma in _SQLITE_LOAD_PRAGMAS}
+    try:
+        for pragma, value in _SQLITE_LOAD_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+        sql = None
+        for batch in batches:
+            if sql is None:
+                placeholders = ", ".join("?" for _ in batch.schema.names)
+                sql = (
+                    f"INSERT INTO {quote(table.name)} ({_column_list(engine, batch.schema.names)}) "
+                    f"VALUES ({placeholders})"
+                )
+            cursor.executemany(sql, _python_rows(batch))
+            rows += batch.num_rows
+        connection.commit()
+    finally:
+        try:
+            connection.rollback()
+            for pragma, value in saved.items():
+                cursor.execute(f"PRAGMA {pragma} = {value}")
+        finally:
+            connection.close()
+    return rows
+
+_CHUNK_LOADERS: Dict[str, Callable[[sqlalchemy.engine.Engine, sqlalchemy.Table, pa.RecordBatch], None]] = {
+    "postgresql": _copy_postgresql,
+    "mysql": _load_data_mysql,
+}
+
+def _load_parallel(
+    engine: sqlalchemy.engine.Engine,
+    table: sqlalchemy.Table,
+    batches: Iterable[pa.RecordBatch],
+    parallelism: int
+) -> int:
+    """Load chunks concurrently on pooled connections with bounded in-flight chunks"""
+    loader = _CHUNK_LOADERS.get(engine.dialect.name, _insert_generic)
+    rows = 0
+    pending: Deque[Future] = deque()
+    with ThreadPoolExecutor(max_workers=parallelism) as executor:
+        for batch in batches:
+            pending.append(executor.submit(loader, engine, table, batch))
+            rows += batch.num_rows
+            if len(pending) >= parallelism * 2:
+                pending.popleft().result()
+        while pending:
+            pending.popleft().result()
+    return rows
+
+def _swap_table(engine: sqlalchemy.engine.Engine, staging: sqlalchemy.Table, table_name: str):
+    """Replace the target table with the loaded staging table"""
+    quote = engine.dialect.identifier_preparer.quote
+    target = quote(table_name)
+    exists = sqlalchemy.inspect(engine).has_table(table_name)
+    with engine.begin() as connection:
+        if engine.dialect.name == "mysql":
+            if exists:
+                retired = quote(f"{table_name}__retired_{uuid.uuid4().hex[:8]}")
+                connection.exec_driver_sql(
+                    f"RENAME TABLE {target} TO {retired}, {quote(staging.name)} TO {target}"
+                )
+                connection.exec_driver_sql(f"DROP TABLE {retired}")
+            else:
+                connection.exec_driver_sql(f"RENAME TABLE {quote(staging.name)} TO {target}")
+        else:
+            if exists:
+                connection.exec_driver_sql(f"DROP TABLE {target}")
+            connection.exec_driver_sql(f"ALTER TABLE {quote(staging.name)} RENAME TO {target}")
+
+def bulk_load(
+    batches: Iterable[pa.RecordBatch],
+    table_name: str,
+    connection_string: str,
+    parallelism: int = DEFAULT_PARALLELISM
+) -> int:
+    """Bulk-load a stream of record batches into a table through a staging table"""
+    engine = get_engine(connection_string)
+    batches = iter(batches)
+    first = next(batches, None)
+    if first is None:
+        raise ValueError("No data to load")
+
+    staging = _staging_table(first.schema, table_name)
+    staging.create(engine)
+    try:
+        stream = chain([first], batches)
+        if engine.dialect.name == "sqlite":
+            rows = _load_sqlite(engine, staging, stream)
+        else:
+            rows = _load_parallel(engine, staging, stream, parallelism)
+        _swap_table(engine, staging, table_name)
+    except Exception:
+        staging.drop(engine, checkfirst=True)
+        raise
+    return rows
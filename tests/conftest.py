@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pyarrow as pa
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_models import DataField, DataModel, FieldType  # noqa: E402
+
+@pytest.fixture
+def model() -> DataModel:
+    """One field of every generated type, with nulls and unique fields mixed in"""
+    return DataModel(
+        name="Test Data",
+        description="Every field type",
+        category="Test",
+        fields=[
+            DataField(name="id", description="Unique id", type=FieldType.INTEGER, unique=True,
+                      options={"min": 1, "max": 10_000_000}),
+            DataField(name="uuid", description="UUID", type=FieldType.UUID),
+            DataField(name="name", description="Name", type=FieldType.NAME),
+            DataField(name="email", description="Email", type=FieldType.EMAIL, required=False,
+                      options={"null_rate": 0.2}),
+            DataField(name="score", description="Score", type=FieldType.FLOAT, options={"min": 0, "max": 10}),
+            DataField(name="code", description="Code", type=FieldType.STRING, unique=True),
+            DataField(name="active", description="Active", type=FieldType.BOOLEAN),
+            DataField(name="day", description="Day", type=FieldType.DATE),
+            DataField(name="at", description="Timestamp", type=FieldType.DATETIME, required=False),
+            DataField(name="status", description="Status", type=FieldType.CATEGORY,
+                      options={"categories": ["new", "paid", "shipped"], "weights": [1, 2, 1]}),
+            DataField(name="sku", description="SKU", type=FieldType.PATTERN, unique=True,
+                      options={"pattern": "SKU-??-####"}),
+        ]
+    )
+
+def decoded(data) -> pa.Table:
+    """Table with dictionary columns decoded, so per-batch dictionaries compare equal"""
+    table = data if isinstance(data, pa.Table) else pa.Table.from_batches(data)
+    table = table.combine_chunks()
+    return pa.table({
+        name: column.cast(column.type.value_type) if pa.types.is_dictionary(column.type) else column
+        for name, column in zip(table.column_names, table.columns)
+    })
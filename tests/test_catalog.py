@@ -0,0 +1,35 @@
+import json
+import os
+
+from catalog import ModelCatalog
+
+def _model(name, **extra):
+    return {"name": name, "description": "", "category": "Test", "fields": [], **extra}
+
+def test_prefix_search_finds_every_match(tmp_path):
+    models = [_model(f"pa{index:04d}") for index in range(300)] + [_model("payments")]
+    (tmp_path / "models.json").write_text(json.dumps(models))
+    catalog = ModelCatalog(str(tmp_path))
+    names = [model.name for model in catalog.search("pa")]
+    assert len(names) == 301
+    assert "payments" in names
+    # Whole-word matches rank above prefix matches
+    assert catalog.search("payments")[0].name == "payments"
+
+def test_incremental_reload(tmp_path):
+    (tmp_path / "a.json").write_text(json.dumps(_model("Orders", tags=["sales"])))
+    (tmp_path / "b.json").write_text(json.dumps(_model("Invoices")))
+    catalog = ModelCatalog(str(tmp_path), reload_interval=0)
+    assert [model.name for model in catalog.search("sales")] == ["Orders"]
+
+    (tmp_path / "a.json").write_text(json.dumps(_model("Refunds", tags=["sales", "returns"])))
+    os.remove(tmp_path / "b.json")
+    (tmp_path / "broken.json").write_text("{")
+    assert [model.name for model in catalog.search("sales")] == ["Refunds"]
+    assert catalog.search("invoices") == []
+    assert str(tmp_path / "broken.json") in catalog.errors
+
+def test_field_suggestions(tmp_path):
+    catalog = ModelCatalog(str(tmp_path))
+    assert "customer_id" in [field.name for field in catalog.suggest_fields("customer")]
+    assert [field.name for field in catalog.suggest_fields("zzzz")] == ["id", "created_at", "updated_at"]
@@ -0,0 +1,93 @@
+import os
+
+import pytest
+
+import cloud_storage
+from cloud_storage import LocalBackend, MultipartWriter
+
+PART_SIZE = 1024
+
+class FlakyBackend(LocalBackend):
+    """Local backend whose part uploads fail a set number of times each"""
+
+    def __init__(self, bucket, root, failures):
+        super().__init__(bucket, root)
+        self.failures = failures
+        self.attempts = {}
+
+    def upload_part(self, upload_id, key, part_number, data):
+        self.attempts[part_number] = self.attempts.get(part_number, 0) + 1
+        if self.attempts[part_number] <= self.failures:
+            raise ConnectionError("connection reset")
+        return super().upload_part(upload_id, key, part_number, data)
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(cloud_storage, "RETRY_BACKOFF_SECONDS", 0)
+
+def _payload(size):
+    return bytes(range(256)) * (size // 256) + bytes(size % 256)
+
+@pytest.mark.parametrize("size", [0, PART_SIZE, 10 * PART_SIZE + 17])
+def test_parts_assemble_into_the_object(tmp_path, size):
+    backend = LocalBackend("bucket", str(tmp_path))
+    writer = MultipartWriter(backend, "exports/data.bin", part_size=PART_SIZE, max_in_flight=3)
+    data = _payload(size)
+    # Uneven writes straddle part boundaries
+    for offset in range(0, size, 700):
+        writer.write(data[offset:offset + 700])
+    assert writer.tell() == size
+    writer.close()
+    assert (tmp_path / "bucket" / "exports" / "data.bin").read_bytes() == data
+    assert os.listdir(tmp_path / "bucket" / ".uploads") == []
+    assert backend.url("exports/data.bin") == f"file://{tmp_path / 'bucket' / 'exports' / 'data.bin'}"
+
+def test_failed_parts_are_retried(tmp_path):
+    backend = FlakyBackend("bucket", str(tmp_path), failures=2)
+    writer = MultipartWriter(backend, "data.bin", part_size=PART_SIZE, max_retries=2)
+    data = _payload(5 * PART_SIZE)
+    writer.write(data)
+    writer.close()
+    assert (tmp_path / "bucket" / "data.bin").read_bytes() == data
+    assert backend.attempts == {part: 3 for part in range(1, 6)}
+
+def test_upload_is_aborted_when_retries_run_out(tmp_path):
+    backend = FlakyBackend("bucket", str(tmp_path), failures=3)
+    writer = MultipartWriter(backend, "data.bin", part_size=PART_SIZE, max_retries=2)
+    # As in export_data: a failed write or close aborts the upload
+    with pytest.raises(ConnectionError):
+        try:
+            writer.write(_payload(5 * PART_SIZE))
+            writer.close()
+        except BaseException:
+            writer.abort()
+            raise
+    assert not (tmp_path / "bucket" / "data.bin").exists()
+    assert os.listdir(tmp_path / "bucket" / ".uploads") == []
+
+def test_abort_discards_uploaded_parts(tmp_path):
+    backend = LocalBackend("bucket", str(tmp_path))
+    writer = MultipartWriter(backend, "data.bin", part_size=PART_SIZE)
+    writer.write(_payload(3 * PART_SIZE))
+    writer.abort()
+    writer.close()
+    assert not (tmp_path / "bucket" / "data.bin").exists()
+    assert os.listdir(tmp_path / "bucket" / ".uploads") == []
+
+def test_unknown_provider_is_rejected():
+    with pytest.raises(ValueError, match="Unsupported storage provider"):
+        cloud_storage.get_backend("ftp", "bucket")
+
+def test_incomplete_backend_fails_when_created():
+    class NoAbort(cloud_storage.StorageBackend):
+        def start(self, key):
+            return "upload"
+
+        def upload_part(self, upload_id, key, part_number, data):
+            return part_number
+
+        def complete(self, upload_id, key, parts):
+            pass
+
+    with pytest.raises(TypeError, match="abort"):
+        NoAbort()
@@ -0,0 +1,64 @@
+import io
+import os
+import time
+
+import pytest
+
+from conftest import decoded
+from dataset_store import DatasetStore
+from generator import field_schema, generate_data_iter
+
+ROWS = 12_000
+
+@pytest.fixture
+def store(tmp_path) -> DatasetStore:
+    return DatasetStore(str(tmp_path), ttl_seconds=60)
+
+def test_write_then_get_returns_the_same_data(model, store):
+    batches = generate_data_iter(model, ROWS, 5_000, seed=3, max_workers=1)
+    written = store.write("key", batches, field_schema(model))
+    assert written.num_rows == ROWS
+    handle = store.get("key")
+    assert (handle.num_rows, handle.column_names) == (ROWS, model.field_names)
+    expected = decoded(generate_data_iter(model, ROWS, 5_000, seed=3, max_workers=1))
+    assert decoded(handle.read()).equals(expected)
+    assert decoded(handle.head(10)).equals(expected.slice(0, 10))
+    assert sum(batch.num_rows for batch in handle.iter_batches(max_chunksize=1_000)) == ROWS
+
+def test_missing_and_partial_datasets_are_not_found(model, store, tmp_path):
+    assert store.get("missing") is None
+
+    def failing():
+        yield from generate_data_iter(model, 100, seed=3, max_workers=1)
+        raise RuntimeError("generation failed")
+
+    with pytest.raises(RuntimeError):
+        store.write("key", failing(), field_schema(model))
+    assert store.get("key") is None
+    assert os.listdir(tmp_path) == []
+
+def test_files_idle_past_the_ttl_are_removed(model, store, tmp_path):
+    store.write("old", generate_data_iter(model, 100, seed=3, max_workers=1), field_schema(model))
+    store.write("new", generate_data_iter(model, 100, seed=4, max_workers=1), field_schema(model))
+    download = store.write_file("old-export", io.BytesIO(b"a,b\n1,2\n"))
+    expired = time.time() - 120
+    for path in (tmp_path / "old.arrow", download):
+        os.utime(path, (expired, expired))
+    assert store.cleanup(force=True) == 2
+    assert store.get("old") is None
+    assert store.get("new") is not None
+
+def test_reads_refresh_the_ttl(model, store, tmp_path):
+    handle = store.write("key", generate_data_iter(model, 100, seed=3, max_workers=1), field_schema(model))
+    expired = time.time() - 120
+    os.utime(handle.path, (expired, expired))
+    handle.read()
+    assert store.cleanup(force=True) == 0
+    assert handle.exists
+
+def test_stored_downloads_are_found_by_key(store):
+    assert store.get_file("export") is None
+    path = store.write_file("export", io.BytesIO(b"a,b\n1,2\n"))
+    assert store.get_file("export") == path
+    with open(path, "rb") as f:
+        assert f.read() == b"a,b\n1,2\n"
@@ -0,0 +1,103 @@
+import io
+import json
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import pytest
+
+from conftest import decoded
+from exporter import export_data
+from generator import generate_data_iter
+
+ROWS = 5_000
+SEED = 99
+
+@pytest.fixture
+def table(model) -> pa.Table:
+    return decoded(generate_data_iter(model, ROWS, 1_000, SEED, max_workers=1))
+
+def _export(data, format_type, **kwargs) -> bytes:
+    file, _ = export_data(data, format_type, "data", **kwargs)
+    with file:
+        return file.read()
+
+def test_csv_round_trip(model, table):
+    data = _export(generate_data_iter(model, ROWS, 1_000, SEED, max_workers=1), "csv")
+    read = pa_csv.read_csv(io.BytesIO(data))
+    assert read.num_rows == ROWS
+    assert read.column_names == table.column_names
+    assert read["id"].to_pylist() == table["id"].to_pylist()
+    assert read["name"].to_pylist() == table["name"].to_pylist()
+    # UUIDs are written as canonical strings
+    assert len(read["uuid"][0].as_py()) == 36
+
+def test_json_keeps_integers_and_dates(model, table):
+    records = json.loads(_export(generate_data_iter(model, ROWS, 1_000, SEED, max_workers=1), "json"))
+    assert len(records) == ROWS
+    assert [record["id"] for record in records] == table["id"].to_pylist()
+    assert all(isinstance(record["id"], int) for record in records)
+    assert records[0]["day"] == table["day"][0].as_py().isoformat()
+    assert [record["email"] for record in records] == table["email"].to_pylist()
+
+def test_export_large_enough_to_spill(model, monkeypatch):
+    import exporter
+
+    monkeypatch.setattr(exporter, "SPOOL_MAX_SIZE", 1024)
+    file, file_name = export_data(generate_data_iter(model, ROWS, 1_000, SEED, max_workers=1), "csv", "data")
+    with file:
+        assert file_name == "data.csv"
+        assert file._rolled
+        assert len(file.read().splitlines()) == ROWS + 1
+
+def test_empty_json_export():
+    assert json.loads(_export(pa.table({"id": pa.array([], pa.int64())}), "json")) == []
+
+def test_excel_rolls_over_to_new_sheets(model, monkeypatch):
+    import exporter
+    from openpyxl import load_workbook
+
+    monkeypatch.setattr(exporter, "EXCEL_MAX_ROWS", 2_001)
+    data = _export(generate_data_iter(model, ROWS, 1_500, SEED, max_workers=1), "excel")
+    workbook = load_workbook(io.BytesIO(data), read_only=True)
+    sheets = [list(sheet.values) for sheet in workbook.worksheets]
+    assert [len(rows) for rows in sheets] == [2_001, 2_001, 1_001]
+    assert all(rows[0] == tuple(model.field_names) for rows in sheets)
+    ids = [row[0] for rows in sheets for row in rows[1:]]
+    assert ids == decoded(generate_data_iter(model, ROWS, seed=SEED, max_workers=1))["id"].to_pylist()
+
+def test_ndjson_round_trip(model, table):
+    lines = _export(generate_data_iter(model, ROWS, 1_000, SEED, max_workers=1), "ndjson").splitlines()
+    records = [json.loads(line) for line in lines]
+    assert len(records) == ROWS
+    assert [record["id"] for record in records] == table["id"].to_pylist()
+    assert all(isinstance(record["id"], int) for record in records)
+
+@pytest.mark.parametrize("format_type", ["csv", "ndjson"])
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_block_compression_decompresses_as_one_stream(model, monkeypatch, format_type, compression):
+    import exporter
+
+    # Small blocks, so the export is many independently compressed blocks
+    monkeypatch.setattr(exporter, "COMPRESSION_BLOCK_BYTES", 16 * 1024)
+    plain = _export(generate_data_iter(model, ROWS, 1_000, SEED, max_workers=1), format_type)
+    batches = generate_data_iter(model, ROWS, 1_000, SEED, max_workers=1)
+    file, file_name = export_data(batches, format_type, "data", compression=compression)
+    with file:
+        assert file_name == f"data.{exporter.file_extension(format_type, compression)}"
+        with pa.CompressedInputStream(file, compression) as stream:
+            assert stream.read() == plain
+
+@pytest.mark.parametrize("compression", ["snappy", "zstd", "none"])
+def test_parquet_codec_and_row_groups(model, table, compression):
+    data = _export(generate_data_iter(model, ROWS, 700, SEED, max_workers=1), "parquet",
+                   compression=compression, row_group_size=2_000)
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    assert [parquet.metadata.row_group(i).num_rows for i in range(parquet.num_row_groups)] == [2_000, 2_000, 1_000]
+    expected = "UNCOMPRESSED" if compression == "none" else compression.upper()
+    assert parquet.metadata.row_group(0).column(0).compression == expected
+    assert decoded(parquet.read())["id"].equals(table["id"])
+
+def test_unsupported_compression_is_rejected(table):
+    with pytest.raises(ValueError, match="not supported"):
+        export_data(table, "excel", "data", compression="gzip")
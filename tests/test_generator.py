@@ -0,0 +1,72 @@
+import numpy as np
+import pyarrow.compute as pc
+import pytest
+
+from conftest import decoded
+from data_models import DataField, DataModel, FieldType
+from generator import ROW_BLOCK_SIZE, generate_data_iter, generate_rows
+from permutation import FeistelPermutation, blocked_permutation, permutation_key
+
+ROWS = 2 * ROW_BLOCK_SIZE + 5_123
+SEED = 1234
+
+def test_row_ranges_match_full_run(model):
+    full = decoded(generate_data_iter(model, ROWS, seed=SEED, max_workers=1))
+    for start, stop in [(0, 10), (ROW_BLOCK_SIZE - 7, ROW_BLOCK_SIZE + 7), (12_345, ROWS)]:
+        batch = generate_rows(model, SEED, start, stop, ROWS)
+        assert decoded([batch]).equals(full.slice(start, stop - start))
+        sliced = decoded(generate_data_iter(model, ROWS, 3_000, SEED, max_workers=1, row_range=(start, stop)))
+        assert sliced.equals(full.slice(start, stop - start))
+
+@pytest.mark.parametrize("batch_size, max_workers", [(1_000, 1), (7_777, 1), (25_000, 2), (4_096, 3)])
+def test_output_independent_of_batch_size_and_workers(model, batch_size, max_workers):
+    reference = decoded(generate_data_iter(model, ROWS, seed=SEED, max_workers=1))
+    batches = list(generate_data_iter(model, ROWS, batch_size, SEED, max_workers=max_workers))
+    assert all(batch.num_rows == batch_size for batch in batches[:-1])
+    assert decoded(batches).equals(reference)
+
+def test_unique_fields_have_no_duplicates(model):
+    table = decoded(generate_data_iter(model, ROWS, 3_000, SEED, max_workers=2))
+    for name in ("id", "code", "sku"):
+        column = table.column(name)
+        assert column.null_count == 0
+        assert len(pc.unique(column)) == ROWS, name
+
+def test_unique_dates_and_floats():
+    model = DataModel(name="Dates", description="", category="Test", fields=[
+        DataField(name="day", description="", type=FieldType.DATE, unique=True,
+                  options={"start": "2020-01-01", "end": "2099-12-31"}),
+        DataField(name="price", description="", type=FieldType.FLOAT, unique=True,
+                  options={"min": 0, "max": 1000, "decimals": 2}),
+    ])
+    table = decoded(generate_data_iter(model, 20_000, seed=SEED, max_workers=1))
+    assert len(pc.unique(table.column("day"))) == 20_000
+    assert len(pc.unique(table.column("price"))) == 20_000
+
+@pytest.mark.parametrize("field", [
+    DataField(name="n", description="", type=FieldType.INTEGER, unique=True, options={"min": 0, "max": 100}),
+    DataField(name="p", description="", type=FieldType.PATTERN, unique=True, options={"pattern": "X-##"}),
+    DataField(name="c", description="", type=FieldType.CATEGORY, unique=True, options={"categories": ["a", "b"]}),
+])
+def test_unique_capacity_is_checked_before_generating(field):
+    model = DataModel(name="Small", description="", category="Test", fields=[field])
+    with pytest.raises(ValueError, match="unique"):
+        next(generate_data_iter(model, 101, seed=SEED, max_workers=1))
+
+def test_null_rate_is_applied(model):
+    table = decoded(generate_data_iter(model, ROWS, seed=SEED, max_workers=1))
+    assert table.column("email").null_count / ROWS == pytest.approx(0.2, abs=0.02)
+    assert table.column("name").null_count == 0
+
+@pytest.mark.parametrize("domain", [1, 2, 3, 1000, 4096, 65_537])
+def test_feistel_permutation_is_a_bijection(domain):
+    permutation = FeistelPermutation(domain, permutation_key(SEED, "field"))
+    values = permutation(np.arange(domain))
+    assert np.array_equal(np.sort(values), np.arange(domain, dtype=np.uint64))
+
+def test_blocked_permutation_stays_within_blocks():
+    permutation = FeistelPermutation(100, permutation_key(SEED, "field"))
+    indices = np.arange(1_000, dtype=np.uint64)
+    values = blocked_permutation(indices, permutation)
+    assert np.array_equal(values // 100, indices // 100)
+    assert len(np.unique(values)) == len(indices)
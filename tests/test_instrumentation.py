@@ -0,0 +1,22 @@
+from generator import generate_data_iter
+from instrumentation import PerformanceReport
+
+ROWS = 25_000
+
+def _run(model, seed, report):
+    for _ in generate_data_iter(model, ROWS, 7_000, seed, max_workers=1, report=report):
+        pass
+    report.record_export("csv", ROWS, 1.0, 0.5, 100)
+
+def test_report_covers_only_the_latest_run(model):
+    single = PerformanceReport()
+    _run(model, 2, single)
+    report = PerformanceReport()
+    for seed in (1, 2):
+        _run(model, seed, report)
+    summary = report.to_dict()
+    # Reusing a report, as the export page does for lazy datasets, must not accumulate runs
+    assert summary["batch_count"] == single.to_dict()["batch_count"]
+    assert sum(batch["rows"] for batch in summary["batches"]) == ROWS
+    assert len(summary["exports"]) == 1
+    assert set(field["field"] for field in summary["fields"]) == set(model.field_names)
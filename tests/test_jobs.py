@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pyarrow as pa
+
+from jobs import CANCELLED, DONE, FAILED, QUEUED, RUNNING, JobManager
+
+TIMEOUT = 5
+
+def _wait_for(condition):
+    deadline = time.time() + TIMEOUT
+    while not condition():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.01)
+
+def _blocking(job, release: threading.Event):
+    release.wait(TIMEOUT)
+    return job.id
+
+def test_at_most_max_concurrent_jobs_run():
+    manager = JobManager(max_concurrent=2)
+    release = threading.Event()
+    jobs = [manager.submit("test", _blocking, release) for _ in range(4)]
+    _wait_for(lambda: manager.running == 2)
+    time.sleep(0.3)
+    assert [job.status for job in jobs].count(QUEUED) == 2
+    release.set()
+    _wait_for(lambda: all(job.status == DONE for job in jobs))
+    assert [job.result for job in jobs] == [job.id for job in jobs]
+    assert all(job.progress == 1.0 for job in jobs)
+
+def test_running_job_stops_at_the_next_batch():
+    manager = JobManager(max_concurrent=1)
+    started = threading.Event()
+    consumed = []
+
+    def batches():
+        while True:
+            yield pa.record_batch({"id": [1, 2]})
+
+    def consume(job):
+        for batch in job.iterate(batches(), total_rows=1_000_000):
+            consumed.append(batch)
+            started.set()
+            time.sleep(0.01)
+
+    job = manager.submit("test", consume)
+    started.wait(TIMEOUT)
+    job.cancel()
+    _wait_for(lambda: not job.active)
+    assert job.status == CANCELLED
+    assert 0 < job.progress < 1
+    count = len(consumed)
+    time.sleep(0.05)
+    assert len(consumed) == count
+
+def test_queued_job_is_cancelled_without_running():
+    manager = JobManager(max_concurrent=1)
+    release = threading.Event()
+    blocker = manager.submit("test", _blocking, release)
+    _wait_for(lambda: blocker.status == RUNNING)
+    ran = threading.Event()
+    queued = manager.submit("test", lambda job: ran.set())
+    queued.cancel()
+    _wait_for(lambda: not queued.active)
+    release.set()
+    _wait_for(lambda: blocker.status == DONE)
+    assert queued.status == CANCELLED
+    assert queued.started is None and not ran.is_set()
+
+def test_failure_is_recorded_and_frees_the_slot():
+    manager = JobManager(max_concurrent=1)
+
+    def fail(job):
+        raise ValueError("bad model")
+
+    failed = manager.submit("test", fail)
+    _wait_for(lambda: not failed.active)
+    assert (failed.status, failed.error) == (FAILED, "bad model")
+    done = manager.submit("test", lambda job: 42)
+    _wait_for(lambda: not done.active)
+    assert (done.status, done.result) == (DONE, 42)
+
+def test_oldest_finished_jobs_are_forgotten():
+    manager = JobManager(max_finished=2)
+    jobs = []
+    for value in range(4):
+        jobs.append(manager.submit("test", lambda job, value=value: value))
+        _wait_for(lambda: not jobs[-1].active)
+    manager.submit("test", lambda job: None)
+    assert manager.get(jobs[0].id) is None and manager.get(jobs[1].id) is None
+    assert manager.get(jobs[3].id) is jobs[3]
@@ -0,0 +1,53 @@
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from data_models import DataField, DataModel, FieldType
+from exporter import write_export
+from generator import generate_data_iter
+from profiler import HyperLogLog, _hash, infer_pattern, looks_like_names, profile_file
+
+@pytest.mark.parametrize("distinct", [100, 50_000, 1_000_000])
+def test_hyperloglog_estimate(distinct):
+    values = np.random.default_rng(distinct).permutation(distinct).astype(np.int64)
+    sketch = HyperLogLog()
+    # Repeats must not change the estimate
+    sketch.add(_hash(pa.array(values)))
+    sketch.add(_hash(pa.array(values[: distinct // 2])))
+    assert sketch.estimate() == pytest.approx(distinct, rel=0.03)
+
+def test_infer_pattern():
+    assert infer_pattern(["AB-12", "XY-90", "QQ-07"]) == "??-##"
+    assert infer_pattern(["A#1", "B#2"]) == "?\\##"
+    assert infer_pattern(["abc", "de"]) is None
+
+def test_looks_like_names():
+    assert looks_like_names(["James Smith", "Mary O'Brien", "Robert Johnson-Lee", "Linda Garcia"])
+    assert not looks_like_names(["Blue Widget", "Steel Bracket", "Garden Hose", "Desk Lamp"])
+    assert not looks_like_names(["james smith", "mary jones"])
+
+@pytest.mark.parametrize("extension", ["csv", "parquet"])
+def test_profile_round_trip(tmp_path, extension):
+    model = DataModel(name="Source", description="", category="Test", fields=[
+        DataField(name="age", description="", type=FieldType.INTEGER, options={"min": 18, "max": 90}),
+        DataField(name="status", description="", type=FieldType.CATEGORY,
+                  options={"categories": ["a", "b"], "weights": [3, 1]}),
+        DataField(name="code", description="", type=FieldType.PATTERN, required=False,
+                  options={"pattern": "???-#####", "null_rate": 0.1}),
+        DataField(name="customer", description="", type=FieldType.NAME),
+    ])
+    path = tmp_path / f"source.{extension}"
+    with open(path, "wb") as f:
+        write_export(generate_data_iter(model, 50_000, seed=3, max_workers=1), extension, f)
+
+    fields = {field.name: field for field in profile_file(str(path), batch_rows=8_192).fields}
+    assert fields["age"].type == FieldType.INTEGER
+    assert (fields["age"].options["min"], fields["age"].options["max"]) == (18, 90)
+    assert fields["status"].type == FieldType.CATEGORY
+    assert fields["status"].options["categories"] == ["a", "b"]
+    assert fields["status"].options["weights"][0] == pytest.approx(0.75, abs=0.02)
+    assert fields["code"].type == FieldType.PATTERN
+    assert fields["code"].options["pattern"] == "???-#####"
+    assert not fields["code"].required
+    assert fields["code"].options["null_rate"] == pytest.approx(0.1, abs=0.01)
+    assert fields["customer"].type == FieldType.NAME
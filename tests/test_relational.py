@@ -0,0 +1,49 @@
+import pyarrow.compute as pc
+import pytest
+
+from conftest import decoded
+from data_models import Dataset, ForeignKey, _load_sample_datasets
+from relational import dataset_order, generate_dataset_iter
+
+def _generate(dataset, batch_size=10_000, max_workers=1):
+    return {
+        model.name: decoded(list(batches))
+        for model, _, batches in generate_dataset_iter(dataset, 11, batch_size, max_workers)
+    }
+
+@pytest.fixture
+def dataset() -> Dataset:
+    dataset = _load_sample_datasets()[0]
+    return dataset.copy(update={"rows": {"Customer Data": 3_000, "Product Data": 500}})
+
+def test_parents_come_before_children(dataset):
+    order = dataset_order(dataset)
+    assert order.index("Transaction Data") > order.index("Customer Data")
+    assert order.index("Transaction Data") > order.index("Product Data")
+
+def test_foreign_keys_exist_in_parent(dataset):
+    tables = _generate(dataset)
+    transactions = tables["Transaction Data"]
+    assert transactions.num_rows == 15_000
+    for link in dataset.foreign_keys:
+        parent_keys = tables[link.parent_model].column(link.parent_field)
+        assert pc.all(pc.is_in(transactions.column(link.field), value_set=parent_keys)).as_py(), link.field
+
+def test_foreign_keys_independent_of_batch_size(dataset):
+    reference = _generate(dataset)
+    for table_name, table in _generate(dataset, batch_size=1_234, max_workers=2).items():
+        assert table.equals(reference[table_name]), table_name
+
+def test_skew_concentrates_references(dataset):
+    transactions = _generate(dataset)["Transaction Data"]
+    counts = pc.value_counts(transactions.column("product_id")).field("counts").to_numpy()
+    # Product links use Zipf skew 1.2, so the most popular product is far above the mean
+    assert counts.max() > 10 * counts.mean()
+
+def test_cycles_are_rejected(dataset):
+    cyclic = dataset.copy(update={"foreign_keys": dataset.foreign_keys + [
+        ForeignKey(model="Customer Data", field="customer_id",
+                   parent_model="Transaction Data", parent_field="customer_id")
+    ]})
+    with pytest.raises(ValueError, match="cycle"):
+        dataset_order(cyclic)
@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+from result_cache import ResultCache, derive_key, fingerprint
+
+def test_least_recently_used_entries_are_evicted_first():
+    cache = ResultCache(max_bytes=30)
+    for key in "abc":
+        cache.put(key, key.encode() * 10)
+    assert cache.get("a") == b"a" * 10
+    cache.put("d", b"d" * 10)
+    assert cache.get("b") is None
+    assert [cache.get(key) is not None for key in "acd"] == [True, True, True]
+    assert cache.memory_bytes == 30
+
+def test_entry_larger_than_the_budget_is_not_kept():
+    cache = ResultCache(max_bytes=10)
+    cache.put("big", b"x" * 11)
+    assert cache.get("big") is None
+    assert cache.memory_bytes == 0
+
+def test_evicted_entries_spill_to_disk_and_come_back(tmp_path):
+    cache = ResultCache(max_bytes=20, spill_dir=str(tmp_path))
+    for key in "abc":
+        cache.put(key, key.encode() * 10)
+    assert os.listdir(tmp_path) == ["a.bin"]
+    # Reading a spilled entry moves it back into memory and spills the oldest one instead
+    assert cache.get("a") == b"a" * 10
+    assert os.listdir(tmp_path) == ["b.bin"]
+    assert cache.get("b") == b"b" * 10
+
+def test_spill_directory_is_bounded(tmp_path):
+    cache = ResultCache(max_bytes=10, spill_dir=str(tmp_path), spill_max_bytes=20)
+    for key in "abcd":
+        cache.put(key, key.encode() * 10)
+    assert sorted(os.listdir(tmp_path)) == ["b.bin", "c.bin"]
+    assert cache.get("a") is None
+
+def test_configure_shrinks_the_budget(tmp_path):
+    cache = ResultCache(max_bytes=100, spill_dir=str(tmp_path))
+    for key in "abc":
+        cache.put(key, key.encode() * 10)
+    cache.configure(max_bytes=10, spill_dir=str(tmp_path))
+    assert cache.memory_bytes == 10
+    assert sorted(os.listdir(tmp_path)) == ["a.bin", "b.bin"]
+    cache.configure(max_bytes=10, spill_dir=None)
+    assert os.listdir(tmp_path) == []
+    assert cache.get("a") is None
+
+def test_only_bytes_are_cached():
+    with pytest.raises(TypeError):
+        ResultCache().put("key", "text")
+
+def test_keys_depend_on_model_and_parameters(model):
+    key = fingerprint(model, rows=10, seed=1)
+    assert key == fingerprint(model, seed=1, rows=10)
+    assert key != fingerprint(model, rows=10, seed=2)
+    assert derive_key(key, format="csv") != derive_key(key, format="json")
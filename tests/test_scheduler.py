@@ -0,0 +1,42 @@
+import operator
+import threading
+
+import pytest
+
+import scheduler
+from conftest import decoded
+from generator import effective_workers, generate_data_iter
+
+@pytest.fixture
+def pool(monkeypatch):
+    """A fresh two-process pool, whatever the machine's CPU count"""
+    scheduler.shutdown_executor()
+    monkeypatch.setattr(scheduler, "POOL_WORKERS", 2)
+    yield
+    scheduler.shutdown_executor()
+
+def test_results_arrive_in_task_order(pool):
+    assert list(scheduler.run_ordered(operator.neg, range(50), max_workers=2)) == [-n for n in range(50)]
+
+def test_runs_with_different_worker_counts_share_one_pool(pool):
+    results = {}
+
+    def run(max_workers):
+        results[max_workers] = list(scheduler.run_ordered(operator.neg, range(200), max_workers))
+
+    threads = [threading.Thread(target=run, args=(max_workers,)) for max_workers in (2, 3, 5)]
+    executor = scheduler.get_executor()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {max_workers: [-n for n in range(200)] for max_workers in (2, 3, 5)}
+    assert scheduler.get_executor() is executor
+
+def test_workers_are_capped_by_the_pool(pool):
+    assert effective_workers(100_000, 10_000, 8) == 2
+    assert effective_workers(100_000, 100_000, 8) == 1
+
+def test_pool_output_matches_in_process_output(pool, model):
+    in_process = decoded(generate_data_iter(model, 35_000, 5_000, seed=8, max_workers=1))
+    assert decoded(generate_data_iter(model, 35_000, 5_000, seed=8, max_workers=4)).equals(in_process)
@@ -0,0 +1,60 @@
+import glob
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from conftest import decoded
+from generator import generate_data_iter
+import sharding
+from sharding import create_manifest, load_manifest, run_shards
+
+ROWS = 25_000
+SHARD_ROWS = 10_000
+
+def _shards_table(directory, schema):
+    # Parquet has no second-resolution timestamps, so parts are cast back to the generated schema
+    parts = [decoded(pq.read_table(path)) for path in sorted(glob.glob(os.path.join(directory, "part-*.parquet")))]
+    return pa.concat_tables(parts).cast(schema)
+
+def test_shards_match_a_single_run(model, tmp_path):
+    summary = run_shards(model, ROWS, str(tmp_path), seed=7, shard_rows=SHARD_ROWS, max_workers=1)
+    assert summary == {"shards": 3, "written": 3, "skipped": 0, "complete": 3, "total": 3}
+    full = decoded(generate_data_iter(model, ROWS, seed=7, max_workers=1))
+    assert _shards_table(tmp_path, full.schema).equals(full)
+
+def test_resume_rewrites_only_missing_shards(model, tmp_path):
+    run_shards(model, ROWS, str(tmp_path), seed=7, shard_rows=SHARD_ROWS, max_workers=1)
+    schema = decoded(pq.read_table(tmp_path / "part-00000.parquet")).schema
+    before = _shards_table(tmp_path, schema)
+    os.remove(tmp_path / "part-00001.parquet")
+    (tmp_path / "part-00001.parquet.999.tmp").write_bytes(b"partial")
+
+    # The seed comes from the manifest when omitted
+    summary = run_shards(model, ROWS, str(tmp_path), shard_rows=SHARD_ROWS, max_workers=1)
+    assert (summary["written"], summary["skipped"], summary["complete"]) == (1, 2, 3)
+    assert not glob.glob(str(tmp_path / "*.tmp"))
+    assert _shards_table(tmp_path, schema).equals(before)
+
+def test_nodes_split_the_shards(model, tmp_path):
+    first = run_shards(model, ROWS, str(tmp_path), seed=7, shard_rows=SHARD_ROWS, max_workers=1,
+                       node_index=0, node_count=2)
+    second = run_shards(model, ROWS, str(tmp_path), seed=7, shard_rows=SHARD_ROWS, max_workers=1,
+                        node_index=1, node_count=2)
+    assert (first["written"], second["written"], second["complete"]) == (2, 1, 3)
+
+def test_different_job_in_same_directory_is_rejected(model, tmp_path):
+    run_shards(model, ROWS, str(tmp_path), seed=7, shard_rows=SHARD_ROWS, max_workers=1)
+    assert load_manifest(str(tmp_path))["seed"] == 7
+    with pytest.raises(ValueError, match="different job"):
+        run_shards(model, ROWS + 1, str(tmp_path), seed=7, shard_rows=SHARD_ROWS, max_workers=1)
+
+def test_node_losing_the_manifest_race_adopts_the_winners_seed(model, tmp_path, monkeypatch):
+    winner = create_manifest(str(tmp_path), model, ROWS, shard_rows=SHARD_ROWS)
+    # Both nodes found no manifest before either wrote one
+    results = iter([None])
+    monkeypatch.setattr(sharding, "load_manifest", lambda output_dir: next(results, None) or load_manifest(output_dir))
+    loser = create_manifest(str(tmp_path), model, ROWS, shard_rows=SHARD_ROWS)
+    assert loser["seed"] == winner["seed"] == load_manifest(str(tmp_path))["seed"]
+    assert not glob.glob(str(tmp_path / "*.tmp"))
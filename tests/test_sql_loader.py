@@ -0,0 +1,60 @@
+import sqlite3
+
+import pyarrow as pa
+import pytest
+
+import sql_loader
+from exporter import export_data
+from generator import generate_data_iter
+
+ROWS = 12_345
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "data.db"
+    yield path, f"sqlite:///{path}"
+    sql_loader.dispose_engines()
+
+def _rows(path, sql):
+    with sqlite3.connect(path) as connection:
+        return connection.execute(sql).fetchall()
+
+def test_bulk_load_writes_every_row(model, database):
+    path, url = database
+    export_data(generate_data_iter(model, ROWS, 4_000, seed=5, max_workers=1), "sql", "items",
+                db_type="sqlite", connection_string=url)
+    assert _rows(path, "SELECT COUNT(*), COUNT(DISTINCT id) FROM items") == [(ROWS, ROWS)]
+    # Nulls load as NULL, not as empty strings
+    assert _rows(path, "SELECT COUNT(*) FROM items WHERE email = ''") == [(0,)]
+    assert len(_rows(path, "SELECT uuid FROM items LIMIT 1")[0][0]) == 36
+    # Only the target table remains once its staging table is renamed
+    assert _rows(path, "SELECT name FROM sqlite_master WHERE type = 'table'") == [("items",)]
+
+def test_bulk_load_replaces_the_table(database):
+    path, url = database
+    sql_loader.bulk_load([pa.record_batch({"id": [1, 2, 3]})], "items", url)
+    rows = sql_loader.bulk_load([pa.record_batch({"id": [7], "name": ["x"]})], "items", url)
+    assert rows == 1
+    assert _rows(path, "SELECT id, name FROM items") == [(7, "x")]
+
+def test_failed_load_keeps_the_old_table(database):
+    path, url = database
+    sql_loader.bulk_load([pa.record_batch({"id": [1, 2, 3]})], "items", url)
+
+    def batches():
+        yield pa.record_batch({"id": [4]})
+        raise RuntimeError("generation failed")
+
+    with pytest.raises(RuntimeError):
+        sql_loader.bulk_load(batches(), "items", url)
+    assert _rows(path, "SELECT id FROM items") == [(1,), (2,), (3,)]
+    assert _rows(path, "SELECT name FROM sqlite_master WHERE type = 'table'") == [("items",)]
+
+def test_sqlite_pragmas_are_restored(database):
+    path, url = database
+    with sqlite3.connect(path) as connection:
+        connection.execute("PRAGMA journal_mode = WAL")
+    sql_loader.bulk_load([pa.record_batch({"id": [1]})], "items", url)
+    with sql_loader.get_engine(url).connect() as connection:
+        pragmas = [connection.exec_driver_sql(f"PRAGMA {pragma}").scalar() for pragma in ("journal_mode", "synchronous")]
+    assert pragmas == ["wal", 2]
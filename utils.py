@@ -1,8 +1,9 @@
 import platform
 import sys
-import streamlit as st
-import time
-@st.cache_data
+from typing import Optional
+from functools import lru_cache
+
+@lru_cache(maxsize=None)
 def load_css() -> str:
     """Load CSS styles with caching"""
     try:
@@ -19,17 +20,15 @@ def get_os_info() -> str:
     """Get operating system information"""
     return f"{platform.system()} {platform.release()}"
 
+def format_bytes(size: Optional[int]) -> str:
+    """Format a byte count with a binary unit"""
+    if size is None:
+        return "n/a"
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size:,.1f} {unit}" if unit != "B" else f"{size:,} {unit}"
+        size /= 1024
+
 def format_number(number: int) -> str:
     """Format large numbers with commas"""
     return "{:,}".format(number)
-
-@st.cache_data
-def measure_performance(func):
-    """Decorator to measure function performance"""
-    def wrapper(*args, **kwargs):
-        start_time = time.time()
-        result = func(*args, **kwargs)
-        end_time = time.time()
-        st.caption(f"Function '{func.__name__}' executed in {end_time-start_time:.4f} seconds")
-        return result
-    return wrapper